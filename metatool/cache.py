@@ -0,0 +1,189 @@
+import sqlite3, threading, time, zlib
+from collections import OrderedDict
+
+try:
+    from metatool import config
+except ImportError:
+    import config
+
+'''
+Caches for the raw payloads retrieved from remote services (doi.org, Entrez,
+handle.net, ORCID), so that values which are validated again are not looked up
+again until their source's TTL has expired.  Two backends are provided: an
+in-memory LRU cache, and an SQLite cache which persists between runs.  Both
+are bounded in the number of entries they hold, and evict the least recently
+used entries first.
+
+Values are strings, and are stored per source (e.g. "crossref") under a key
+(e.g. the URL they were retrieved from).
+'''
+
+class ResponseCache(object):
+    def __init__(self, max_entries=None, ttls=None, default_ttl=None):
+        self.max_entries = max_entries
+        self.ttls = ttls if ttls is not None else {}
+        self.default_ttl = default_ttl
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def get(self, source, key):
+        raise NotImplementedError
+
+    def set(self, source, key, value, ttl=None):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def ttl(self, source):
+        return self.ttls.get(source, self.default_ttl)
+
+    def stats(self):
+        # source -> {"hits" : n, "misses" : n, "sets" : n, "evictions" : n}
+        with self._stats_lock:
+            return dict([(source, dict(counts)) for source, counts in self._stats.iteritems()])
+
+    def _count(self, source, stat, n=1):
+        with self._stats_lock:
+            if source not in self._stats:
+                self._stats[source] = {"hits" : 0, "misses" : 0, "sets" : 0, "evictions" : 0}
+            self._stats[source][stat] += n
+
+    def _expires(self, source, ttl):
+        if ttl is None:
+            ttl = self.ttl(source)
+        return time.time() + ttl if ttl is not None else None
+
+class MemoryCache(ResponseCache):
+    def __init__(self, max_entries=None, ttls=None, default_ttl=None):
+        super(MemoryCache, self).__init__(max_entries, ttls, default_ttl)
+        # (source, key) -> (value, expires), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source, key):
+        with self._lock:
+            entry = self._entries.pop((source, key), None)
+            if entry is not None and entry[1] is not None and entry[1] < time.time():
+                entry = None
+            if entry is not None:
+                self._entries[(source, key)] = entry # put it back as the most recently used
+        self._count(source, "misses" if entry is None else "hits")
+        return entry[0] if entry is not None else None
+
+    def set(self, source, key, value, ttl=None):
+        evicted = []
+        with self._lock:
+            self._entries.pop((source, key), None)
+            self._entries[(source, key)] = (value, self._expires(source, ttl))
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                (esource, ekey), entry = self._entries.popitem(last=False)
+                evicted.append(esource)
+        self._count(source, "sets")
+        for esource in evicted:
+            self._count(esource, "evictions")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteCache(ResponseCache):
+    # how many sets to allow between checks that the cache is within max_entries
+    TRIM_INTERVAL = 100
+
+    def __init__(self, path, max_entries=None, ttls=None, default_ttl=None):
+        super(SQLiteCache, self).__init__(max_entries, ttls, default_ttl)
+        self._lock = threading.Lock()
+        self._sets = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS response_cache (source TEXT, key TEXT, value BLOB, expires REAL, accessed REAL, PRIMARY KEY (source, key))")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed)")
+        self._conn.commit()
+
+    def get(self, source, key):
+        now = time.time()
+        value = None
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM response_cache WHERE source = ? AND key = ?", (source, key)).fetchone()
+            if row is not None:
+                if row[1] is not None and row[1] < now:
+                    self._conn.execute("DELETE FROM response_cache WHERE source = ? AND key = ?", (source, key))
+                else:
+                    value = zlib.decompress(row[0]).decode("utf-8")
+                    self._conn.execute("UPDATE response_cache SET accessed = ? WHERE source = ? AND key = ?", (now, source, key))
+                self._conn.commit()
+        self._count(source, "misses" if value is None else "hits")
+        return value
+
+    def set(self, source, key, value, ttl=None):
+        if isinstance(value, unicode):
+            value = value.encode("utf-8")
+        blob = sqlite3.Binary(zlib.compress(value))
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO response_cache (source, key, value, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                                (source, key, blob, self._expires(source, ttl), time.time()))
+            self._conn.commit()
+            self._sets += 1
+            if self._sets % self.TRIM_INTERVAL == 0:
+                self._trim()
+        self._count(source, "sets")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    def _trim(self):
+        # must be called holding the lock.  Throw away anything that has expired
+        # and then the least recently used entries over the limit
+        self._conn.execute("DELETE FROM response_cache WHERE expires < ?", (time.time(),))
+        if self.max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            if count > self.max_entries:
+                rows = self._conn.execute("SELECT rowid, source FROM response_cache ORDER BY accessed LIMIT ?", (count - self.max_entries,)).fetchall()
+                self._conn.executemany("DELETE FROM response_cache WHERE rowid = ?", [(row[0],) for row in rows])
+                for row in rows:
+                    self._count(row[1], "evictions")
+        self._conn.commit()
+
+# the cache configured in config.RESPONSE_CACHE_BACKEND, created when first needed
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = config.RESPONSE_CACHE_BACKEND
+            if backend == "memory":
+                _cache = MemoryCache(config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_TTL, config.RESPONSE_CACHE_DEFAULT_TTL)
+            elif backend == "sqlite":
+                _cache = SQLiteCache(config.RESPONSE_CACHE_PATH, config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_TTL, config.RESPONSE_CACHE_DEFAULT_TTL)
+    return _cache
+
+def get(source, key):
+    c = get_cache()
+    if c is None:
+        return None
+    return c.get(source, key)
+
+def set(source, key, value, ttl=None):
+    c = get_cache()
+    if c is not None:
+        c.set(source, key, value, ttl)
+
+def stats():
+    c = get_cache()
+    if c is None:
+        return {}
+    return c.stats()
+
+# in-memory caches shared by name, e.g. so that memos kept by a plugin module 
+# are the same however many times the module is loaded
+_memos = {}
+
+def memo(name, max_entries=None):
+    with _cache_lock:
+        if name not in _memos:
+            _memos[name] = MemoryCache(max_entries)
+        return _memos[name]
@@ -0,0 +1,130 @@
+import re
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+'''
+Format and check digit validation for whole columns of identifiers (ISSNs,
+ISBNs and ORCIDs) at once.  Each check_* function takes a list of identifier
+strings and returns, for each one, its status (VALID, FORMAT if it is not
+laid out as that kind of identifier, or CHECKSUM if its check digit is wrong)
+along with the check digit it should have and its corrected form.
+
+The check digits are all weighted sums of the other digits, so where numpy is
+installed a column of them is computed as a single matrix product; otherwise
+(and for short columns, where numpy's overheads are not worth it) they are
+computed one at a time.
+'''
+
+VALID = "valid"
+FORMAT = "format"
+CHECKSUM = "checksum"
+
+# scheme -> (weights of the digits before the check digit, modulus, constant),
+# where the check digit is (constant - the weighted sum) mod the modulus, and
+# a check digit of 10 is written X
+SCHEMES = {
+    "issn" : ([8, 7, 6, 5, 4, 3, 2], 11, 11),
+    "isbn10" : ([10, 9, 8, 7, 6, 5, 4, 3, 2], 11, 11),
+    "isbn13" : ([1, 3] * 6, 10, 10),
+    # ISO 7064 MOD 11-2, which doubles the running total after each digit
+    "orcid" : ([2 ** i for i in range(15, 0, -1)], 11, 12)
+}
+
+# columns shorter than this are not worth handing to numpy
+NUMPY_MIN_BATCH = 64
+
+ISSN_HYPHENATED = re.compile("\d{4}-\d{3}[0-9X]")
+ISSN_UNHYPHENATED = re.compile("\d{7}[0-9X]")
+ISBN10 = re.compile("^\d{9}[0-9X]$")
+ISBN13 = re.compile("^\d{12}[0-9X]$")
+ORCID_HYPHENATED = re.compile("(\d{4}-\d{4}-\d{4}-\d{3}[0-9X])")
+ORCID_UNHYPHENATED = re.compile("(\d{15}[0-9X])")
+
+def check_digits(scheme, bodies):
+    # the check digits for the given strings of digits, each of which must be
+    # as long as the scheme's weights
+    weights, modulus, constant = SCHEMES[scheme]
+    if len(bodies) == 0:
+        return []
+    if numpy is not None and len(bodies) >= NUMPY_MIN_BATCH:
+        digits = numpy.frombuffer("".join(bodies).encode("ascii"), dtype=numpy.uint8)
+        digits = digits.reshape(len(bodies), len(weights)).astype(numpy.int64) - ord("0")
+        checks = ((constant - digits.dot(numpy.array(weights, dtype=numpy.int64))) % modulus).tolist()
+    else:
+        checks = [(constant - sum([int(d) * w for d, w in zip(body, weights)])) % modulus for body in bodies]
+    return ["X" if c == 10 else str(c) for c in checks]
+
+def check_issns(issns):
+    # (status, check digit, correction) for each issn; the correction is the
+    # hyphenated form of an unhyphenated issn, otherwise None
+    results = [None] * len(issns)
+    corrections = {}
+    checkable = []
+    for i, issn in enumerate(issns):
+        if ISSN_HYPHENATED.match(issn) is None:
+            if ISSN_UNHYPHENATED.match(issn) is None:
+                results[i] = (FORMAT, None, None)
+                continue
+            corrections[i] = issn[:4] + "-" + issn[4:]
+        checkable.append(i)
+
+    checks = check_digits("issn", [issns[i].replace("-", "")[:7] for i in checkable])
+    for i, check in zip(checkable, checks):
+        status = VALID if check == issns[i][-1] else CHECKSUM
+        results[i] = (status, check, corrections.get(i))
+    return results
+
+def check_isbns(isbns):
+    # (status, check digit, normalised isbn) for each isbn, where the isbn is
+    # normalised by removing spaces, hyphens and any "ISBN:" prefix
+    results = [None] * len(isbns)
+    normalised = {}
+    by_scheme = {"isbn10" : [], "isbn13" : []}
+    for i, isbn in enumerate(isbns):
+        norm = isbn.replace(" ", "").replace("-", "").upper()
+        if norm.startswith("ISBN"):
+            norm = norm[len("ISBN"):]
+        if norm.startswith(":"):
+            norm = norm[1:]
+        normalised[i] = norm
+
+        if ISBN10.match(norm) is not None:
+            by_scheme["isbn10"].append(i)
+        elif ISBN13.match(norm) is not None:
+            by_scheme["isbn13"].append(i)
+        else:
+            results[i] = (FORMAT, None, norm)
+
+    for scheme, indices in by_scheme.iteritems():
+        checks = check_digits(scheme, [normalised[i][:-1] for i in indices])
+        for i, check in zip(indices, checks):
+            status = VALID if check == normalised[i][-1] else CHECKSUM
+            results[i] = (status, check, normalised[i])
+    return results
+
+def check_orcids(orcids):
+    # (status, check digit, orcid) for each orcid string, where orcid is the
+    # hyphenated identifier found in the string, or None if there isn't one
+    results = [None] * len(orcids)
+    oids = {}
+    for i, orcid in enumerate(orcids):
+        m = ORCID_HYPHENATED.search(orcid)
+        if m is not None:
+            oids[i] = m.groups()[0]
+            continue
+        m = ORCID_UNHYPHENATED.search(orcid)
+        if m is not None:
+            s = m.groups()[0]
+            oids[i] = s[:4] + "-" + s[4:8] + "-" + s[8:12] + "-" + s[12:]
+        else:
+            results[i] = (FORMAT, None, None)
+
+    indices = sorted(oids.keys())
+    checks = check_digits("orcid", [oids[i].replace("-", "")[:15] for i in indices])
+    for i, check in zip(indices, checks):
+        status = VALID if check == oids[i][-1] else CHECKSUM
+        results[i] = (status, check, oids[i])
+    return results
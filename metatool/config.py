@@ -1,6 +1,130 @@
 BASE_URL = "http://93.93.131.168:5007"
 ES_HOST = "http://93.93.131.168:9200"
 FACET_FIELD = '.exact'
+
+# path to a file in which to cache the results of plugin discovery, so that 
+# subsequent start-ups can skip scanning the plugins directory (relative to 
+# the metatool package directory unless absolute, e.g. "plugin_manifest.json"
+# where the package directory is writable).  None to disable
+PLUGIN_MANIFEST = None
+
+# when starting from an up to date manifest, only import each plugin module
+# the first time one of its plugins is actually used
+PLUGIN_LAZY_LOAD = True
+
+# maximum number of values to validate at once when validating with the
+# concurrent=True option
+VALIDATION_THREADS = 10
+
+# how many records iter_validate_model reads before validating them together,
+# and how many batches it may validate in the background while reading on
+VALIDATION_BATCH_RECORDS = 100
+VALIDATION_PIPELINE_DEPTH = 2
+
+# maximum number of fieldsets/models being started in the background at once
+# with async_validate_fieldset/async_validate_model (once their lookups have
+# been started they no longer count towards this)
+ASYNC_VALIDATIONS = 50
+
+# the remote services used to check the realism of identifiers.  Point these at
+# local stand-in servers to test without going out to the real ones
+DOI_RESOLVER = "http://dx.doi.org/"
+HANDLE_RESOLVER = "http://hdl.handle.net/"
+ENTREZ_EFETCH = "http://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+ENTREZ_ESUMMARY = "http://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+
+# maximum number of PMIDs to resolve in a single Entrez request
+ENTREZ_BATCH_SIZE = 200
+
+# maximum number of ISSNs or journal titles to search the ACAT for at once, and
+# how many of the results (for how long, in seconds) to keep for validation
+ACAT_BATCH_SIZE = 100
+ACAT_PREFETCH_MAX_ENTRIES = 10000
+ACAT_PREFETCH_TTL = 3600
+
+# the ISO-639-2 code list to read the language codes from (None for the one in
+# resources), and where to cache the parsed list (e.g. 
+# "/var/cache/metatool/language_codes.marshal"; None to not cache it)
+LANGUAGE_CODES = None
+LANGUAGE_TABLE_CACHE = None
+
+# the most partial matches to suggest for a language name not found exactly
+LANGUAGE_PARTIAL_MATCHES = 5
+
+# how many date strings to remember the parsed interpretations of
+DATE_PARSE_CACHE_SIZE = 10000
+
+# keep a local snapshot of the ACAT journal index in memory and validate ISSNs
+# and journal titles against that rather than searching the ACAT each time.  
+# The snapshot can be saved to ACAT_SNAPSHOT_PATH (e.g. 
+# "/var/lib/metatool/acat_snapshot.json"; None to not save it), so that it can
+# be used while the ACAT is unreachable.  It is loaded, and refreshed with
+# changes from the ACAT every ACAT_SNAPSHOT_REFRESH seconds, in the background,
+# and a failed attempt to do so is retried after ACAT_SNAPSHOT_RETRY seconds
+ACAT_SNAPSHOT = False
+ACAT_SNAPSHOT_PATH = None
+ACAT_SNAPSHOT_REFRESH = 86400
+ACAT_SNAPSHOT_RETRY = 300
+ACAT_SNAPSHOT_TIMEOUT = 60
+ACAT_SNAPSHOT_PAGE_SIZE = 500
+ACAT_ES_HOST = ES_HOST
+ACAT_JOURNAL_INDEX = ACAT_ES_HOST + "/acat/journal"
+ACAT_UPDATED_FIELD = "last_updated"
+
+# if True, journal titles not in the snapshot are not searched for in the ACAT
+ACAT_SNAPSHOT_ONLY = False
+
+# when a journal title can't be found, suggest up to this many journals from
+# the snapshot whose titles have at least this Levenshtein ratio to it.  
+# Without a snapshot, the suggestions can only come from the titles of (up to
+# ACAT_SEEN_TITLES of) the journals which earlier searches have returned
+ACAT_SUGGESTIONS = 3
+ACAT_SUGGESTION_THRESHOLD = 0.8
+ACAT_SEEN_TITLES = 10000
+
+# timeout (in seconds) for requests to remote services, and any per-host overrides
+HTTP_TIMEOUT = 3
+HTTP_TIMEOUTS = {}
+
+# size of the pool of kept-alive connections shared by remote hosts in general,
+# and of the dedicated pools for the hosts we make most requests to
+HTTP_POOL_SIZE = 10
+HTTP_POOL_SIZES = {
+    "dx.doi.org" : 20,
+    "eutils.ncbi.nlm.nih.gov" : 20,
+    "hdl.handle.net" : 20
+}
+
+# number of threads making the requests from remote.get_async, and so the 
+# most requests it has in flight at once
+HTTP_ASYNC_REQUESTS = 50
+
+# cache for the payloads retrieved from remote services: "memory", "sqlite" 
+# (stored at RESPONSE_CACHE_PATH) or None to disable
+RESPONSE_CACHE_BACKEND = "memory"
+RESPONSE_CACHE_PATH = "metatool_cache.sqlite"
+
+# maximum number of payloads to cache, beyond which the least recently used are dropped
+RESPONSE_CACHE_MAX_ENTRIES = 100000
+
+# how long (in seconds) to keep payloads from each source
+RESPONSE_CACHE_DEFAULT_TTL = 86400
+RESPONSE_CACHE_TTL = {
+    "crossref" : 604800,
+    "entrez" : 604800,
+    "handle" : 86400,
+    "orcid" : 86400
+}
+
+# how long (in seconds) to remember that a remote service could not find 
+# something (a 4xx response).  0 to not remember
+RESPONSE_CACHE_NEGATIVE_TTL = 3600
+
+# number of consecutive timeouts/server errors after which to stop sending
+# requests to a host (None to never stop), and how long (in seconds) to wait
+# before trying it again
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_RESET = 60
 MAPPINGS = {
     "publication" : {
         "publication" : {
@@ -0,0 +1,144 @@
+import os, io, marshal, threading
+
+try:
+    from metatool import config
+except ImportError:
+    import config
+
+'''
+The ISO-639 language codes and names, read from the Library of Congress's
+ISO-639-2 code list (resources/ISO-639-2_utf-8.txt) into a single registry
+shared by the language validators and comparators.
+
+Each language is a tuple of (iso-639-2 bibliographic code, iso-639-2
+terminology code, iso-639-1 code, English name, French name), with "" for
+the codes it does not have.  The registry indexes the languages by each kind
+of code and by lower case English name.
+
+If config.LANGUAGE_TABLE_CACHE is set, the parsed list is cached there with
+marshal, and only read from the code list again when that changes.  The 
+cache is left alone (and the list just parsed each time) if it can't be 
+written.
+'''
+
+ISO6392, TERMINOLOGY, ISO6391, NAME, FRENCH_NAME = range(5)
+
+class SubstringIndex(object):
+    """
+    Finds the strings containing a query string.  Every substring of up to n
+    characters of each string is indexed, so a short query is answered by one
+    lookup, and a longer one by intersecting the lists for its n-grams (rarest
+    first) and checking the few strings left
+    """
+    def __init__(self, strings, n=3):
+        self.n = n
+        self._postings = {}
+        for s in strings:
+            for length in range(1, n + 1):
+                for i in range(len(s) - length + 1):
+                    self._postings.setdefault(s[i:i + length], set()).add(s)
+
+    def search(self, query):
+        if len(query) == 0:
+            return set()
+        if len(query) <= self.n:
+            return set(self._postings.get(query, ()))
+        grams = set([query[i:i + self.n] for i in range(len(query) - self.n + 1)])
+        postings = sorted([self._postings.get(g, set()) for g in grams], key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates &= p
+        return set([c for c in candidates if query in c])
+
+class LanguageRegistry(object):
+    def __init__(self, languages):
+        self.languages = languages
+        self.by_iso6392 = {}
+        self.by_terminology = {}
+        self.by_iso6391 = {}
+        self.by_name = {}
+        for language in languages:
+            self.by_iso6392[language[ISO6392]] = language
+            if language[TERMINOLOGY] != "":
+                self.by_terminology[language[TERMINOLOGY]] = language
+            if language[ISO6391] != "":
+                self.by_iso6391[language[ISO6391]] = language
+            self.by_name[language[NAME].lower()] = language
+        self._names = SubstringIndex(self.by_name.keys())
+
+    def partial_matches(self, lang, limit=None):
+        # the lower case names containing lang, best first: those it starts,
+        # then those with a word it starts, then the shortest
+        lang = lang.lower()
+        def rank(name):
+            return (not name.startswith(lang), (" " + lang) not in name, len(name), name)
+        matches = sorted(self._names.search(lang), key=rank)
+        return matches[:limit] if limit is not None else matches
+
+    def to_iso6392(self, lang):
+        # the iso-639-2 code for an iso-639-1 code or English language name, or
+        # None if it is neither
+        language = self.by_iso6391.get(lang)
+        if language is None:
+            language = self.by_name.get(lang)
+        if language is None:
+            return None
+        return language[ISO6392]
+
+# the registry, created when first needed
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LanguageRegistry(_load(_codes_path(), config.LANGUAGE_TABLE_CACHE))
+    return _registry
+
+def _codes_path():
+    if config.LANGUAGE_CODES is not None:
+        return config.LANGUAGE_CODES
+    thisfile_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(thisfile_dir, "..", "resources", "ISO-639-2_utf-8.txt")
+
+def _load(path, cache_path):
+    mtime = os.path.getmtime(path)
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = marshal.load(f)
+            if cached[0] == path and cached[1] == mtime:
+                return cached[2]
+        except (IOError, EOFError, ValueError, TypeError, IndexError):
+            pass
+
+    languages = _parse(path)
+    if cache_path is not None:
+        tmp = cache_path + "." + str(os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                marshal.dump((path, mtime, languages), f)
+            os.rename(tmp, cache_path)
+        except (IOError, OSError, ValueError):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return languages
+
+def _parse(path):
+    # lines are bibliographic|terminology|alpha-2|English name|French name
+    languages = []
+    with io.open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.rstrip(u"\r\n")
+            if line == u"":
+                continue
+            bib, term, alpha2, english, french = line.split(u"|")
+            # the codes are ascii, and looked up often, so intern them
+            codes = [intern(str(c)) for c in (bib, term, alpha2)]
+            languages.append(tuple(codes + [english, french]))
+    return tuple(languages)
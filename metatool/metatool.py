@@ -1,30 +1,175 @@
 import plugin as plugin
-from copy import deepcopy
+from multiprocessing.pool import ThreadPool
+from multiprocessing import TimeoutError
 import config
-import json
+import json, threading
+from collections import OrderedDict, deque
 
 validators = plugin.load_validators()
 comparators = plugin.load_comparators()
 generators = plugin.load_generators()
 
+# lower case datatype -> [(name, validator)], plus the validators which do not
+# declare their datatypes and so have to be asked via supports()
+validator_index, undeclared_validators = plugin.index_by_datatype(validators)
+
+# likewise for the comparators, indexed by crossref name
+comparator_index, undeclared_comparators = plugin.index_by_datatype(comparators)
+
+# crossref name -> {name : comparator}, filled in as each crossref name is first seen
+_comparator_cache = {}
+
+def register_validator(name, validator):
+    validators[name] = validator
+    invalidate_plugin_indexes()
+
+def register_comparator(name, comparator):
+    comparators[name] = comparator
+    invalidate_plugin_indexes()
+
+def invalidate_plugin_indexes():
+    # call this if you modify the validators or comparators directly
+    global validator_index, undeclared_validators, comparator_index, undeclared_comparators
+    validator_index, undeclared_validators = plugin.index_by_datatype(validators)
+    comparator_index, undeclared_comparators = plugin.index_by_datatype(comparators)
+    _comparator_cache.clear()
+
 def validate_field(datatype, value, **validation_options):
     results = []
-    for name, validator in validators.iteritems():
-        if validator.supports(datatype, **validation_options):
-            result = validator.validate(datatype, value, **validation_options)
+    for name, validator in _validators_for(datatype, **validation_options):
+        result = validator.validate(datatype, value, **validation_options)
+        result.provenance = name
+        results.append(result)
+    return results
+
+def validate_column(datatype, values, **validation_options):
+    # as validate_field, but for a list of values of the same datatype, which
+    # each validator is given all at once.  Returns the list of results for 
+    # each value
+    results = [[] for value in values]
+    for name, validator in _validators_for(datatype, **validation_options):
+        responses = validator.validate_column(datatype, values, **validation_options)
+        for value_results, result in zip(results, responses):
             result.provenance = name
-            results.append(result)
+            value_results.append(result)
     return results
 
+def _validators_for(datatype, **validation_options):
+    supporting = list(validator_index.get(datatype.lower(), []))
+    for name, validator in undeclared_validators.iteritems():
+        if validator.supports(datatype, **validation_options):
+            supporting.append((name, validator))
+    return supporting
+
+def _comparators_for(crossref):
+    # the comparators for the crossref name, cheapest first
+    comparator_plugins = _comparator_cache.get(crossref)
+    if comparator_plugins is None:
+        supporting = list(comparator_index.get(crossref.lower(), []))
+        for name, comparator in undeclared_comparators.iteritems():
+            if comparator.supports(crossref):
+                supporting.append((name, comparator))
+        supporting.sort(key=lambda s: (getattr(s[1], "cost", plugin.Comparator.cost), s[0]))
+        comparator_plugins = OrderedDict(supporting)
+        _comparator_cache[crossref] = comparator_plugins
+    return comparator_plugins
+
 def validate_fieldset(fieldset, **validation_options):
     # first task is to validate all the individual fields, which may
     # also obtain from us some data to cross-reference
-    for field in fieldset.fields():
-        datatype = fieldset.datatype(field)
-        for value in fieldset.values(field):
-            results = validate_field(datatype, value, **validation_options)
-            fieldset.results(field, value, results)
+    _validate_values([fieldset], **validation_options)
+    
+    # then cross reference them against that data
+    _cross_reference(fieldset, **validation_options)
+
+def _validate_values(fieldsets, **validation_options):
+    # validate every value of every field in the fieldsets.  The distinct 
+    # values of each datatype are validated together as a column.  If the 
+    # "concurrent" option is set the columns are split into chunks which are
+    # validated on the shared thread pool, so that the remote lookups for 
+    # different values overlap; the results are recorded in the same order 
+    # either way
+    jobs = _jobs(fieldsets)
+    columns = _columns(jobs)
+    if validation_options.get("prefetch", True):
+        _prefetch(columns, **validation_options)
+    
+    chunks = []
+    concurrent = validation_options.get("concurrent", False) and len(jobs) > 1
+    for datatype, values in columns.iteritems():
+        size = len(values)
+        if concurrent:
+            size = max(1, -(-len(values) // (config.VALIDATION_THREADS * 4)))
+        for i in range(0, len(values), size):
+            chunks.append((datatype, values[i:i + size]))
+    
+    validate = lambda chunk: validate_column(chunk[0], chunk[1], **validation_options)
+    if concurrent and len(chunks) > 1:
+        chunk_results = _get_pool().map(validate, chunks)
+    else:
+        chunk_results = [validate(chunk) for chunk in chunks]
+    
+    all_results = {}
+    for (datatype, values), results in zip(chunks, chunk_results):
+        for value, value_results in zip(values, results):
+            all_results[(datatype, value)] = value_results
+    
+    for fieldset, field, datatype, value in jobs:
+        fieldset.results(field, value, all_results[(datatype, value)])
 
+def _jobs(fieldsets):
+    # (fieldset, field, datatype, value) for every value to validate
+    jobs = []
+    for fieldset in fieldsets:
+        for field in fieldset.fields():
+            datatype = fieldset.datatype(field)
+            for value in fieldset.values(field):
+                jobs.append((fieldset, field, datatype, value))
+    return jobs
+
+def _columns(jobs):
+    # datatype -> the distinct values of that datatype, in the order first seen
+    columns = OrderedDict()
+    seen = set()
+    for fieldset, field, datatype, value in jobs:
+        if (datatype, value) in seen:
+            continue
+        seen.add((datatype, value))
+        if datatype not in columns:
+            columns[datatype] = []
+        columns[datatype].append(value)
+    return columns
+
+def _prefetch(columns, **validation_options):
+    # give each validator the chance to look up all of its values at once
+    for datatype, values in columns.iteritems():
+        for name, validator in _validators_for(datatype, **validation_options):
+            validator.prefetch(datatype, values, **validation_options)
+
+# bounded thread pool for concurrent validation, created when first needed
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPool(config.VALIDATION_THREADS)
+    return _pool
+
+# separate pool for starting the asynchronous validations (reading the models
+# and prefetching their values) and for the batches of iter_validate_model,
+# which wait for the values they have handed over to the pool above
+_async_pool = None
+
+def _get_async_pool():
+    global _async_pool
+    with _pool_lock:
+        if _async_pool is None:
+            _async_pool = ThreadPool(config.ASYNC_VALIDATIONS)
+    return _async_pool
+
+def _cross_reference(fieldset, **validation_options):
     # see if there's any crossreferencing we can do
     crossref_data = fieldset.get_crossref_data()
     print crossref_data
@@ -35,12 +180,11 @@ def validate_fieldset(fieldset, **validation_options):
     for field in fieldset.fields():
         crossref = fieldset.crossref(field)
         print "cross-referencing fieldset field", field, "as", crossref
+        if crossref is None:
+            continue
         
-        # prune out all the comparator plugins that don't apply
-        comparator_plugins = {}
-        for name, comparator in comparators.iteritems():
-            if comparator.supports(crossref):
-                comparator_plugins[name] = comparator
+        # only the comparator plugins that apply
+        comparator_plugins = _comparators_for(crossref)
         if len(comparator_plugins.keys()) == 0:
             continue
         
@@ -64,23 +208,61 @@ def validate_fieldset(fieldset, **validation_options):
     
 
 def _list_compare(comparison_register, datatype, original, compare, comparator_plugins, data_source, **comparison_options):
-    additional = deepcopy(compare)
+    # the comparators are tried on each pair of values cheapest first, and once
+    # one succeeds the rest are skipped for that pair (but not for the other
+    # comparison values).  With the exhaustive_comparison option every 
+    # comparator is tried on every pair, and all of their successes are 
+    # registered.  Each distinct pair is only compared once, and its results 
+    # registered for every copy of the values
+    exhaustive = comparison_options.get("exhaustive_comparison", False)
+    source_name = data_source.source_name()
+    
+    # the distinct comparison values, in the order first seen
+    distinct = OrderedDict.fromkeys(compare)
+    
+    # original value -> {comparison value : successful results}
+    compared = {}
+    
+    # each success for an original value takes one copy of it (if there are
+    # any) out of the additional values
+    removals = {}
     for o in original:
+        pairs = compared.get(o)
+        if pairs is None:
+            pairs = {}
+            for c in distinct.iterkeys():
+                successes = []
+                for name, p in comparator_plugins.iteritems():
+                    result = p.compare(datatype, o, c, **comparison_options)
+                    result.compared_with = c
+                    result.comparator = name
+                    result.data_source = source_name
+                    if result.success:
+                        successes.append(result)
+                        if not exhaustive:
+                            break
+                if len(successes) > 0:
+                    pairs[c] = successes
+            compared[o] = pairs
+        
         for c in compare:
-            for name, p in comparator_plugins.iteritems():
-                result = p.compare(datatype, o, c, **comparison_options)
-                result.compared_with = c
-                result.comparator = name
-                result.data_source = data_source.source_name()
-                if result.success:
-                    _append(comparison_register, o, result)
-                    if o in additional:
-                        additional.remove(o)
-                        
+            successes = pairs.get(c)
+            if successes is None:
+                continue
+            for result in successes:
+                _append(comparison_register, o, result)
+            removals[o] = removals.get(o, 0) + len(successes)
+        
         # if we don't get any successful hits, record a blank result for the value
         if o not in comparison_register:
             comparison_register[o] = []
-            
+    
+    additional = []
+    for c in compare:
+        if removals.get(c, 0) > 0:
+            removals[c] -= 1
+        else:
+            additional.append(c)
     return additional
 
 def _append(d, k, v):
@@ -92,12 +274,189 @@ def _append(d, k, v):
 def validate_model(modeltype, model_stream, **validation_options):
     fieldsets = _generate_fieldsets(modeltype, model_stream, **validation_options)
     
+    # validate the values from all the fieldsets together, so that in 
+    # concurrent mode lookups from different fieldsets can overlap too
+    _validate_values(fieldsets, **validation_options)
     for fieldset in fieldsets:
-        validate_fieldset(fieldset, **validation_options)
+        _cross_reference(fieldset, **validation_options)
     
     return fieldsets
 
 
+def iter_validate_model(modeltype, model_stream, **validation_options):
+    # validate a model with many records, yielding the validated fieldsets of
+    # each record in turn.  The records are read and validated lazily, 
+    # config.VALIDATION_BATCH_RECORDS at a time.  Each batch is validated in 
+    # the background while the following ones are read, so that the lookups
+    # for the first records are under way before the model has been parsed,
+    # up to config.VALIDATION_PIPELINE_DEPTH batches ahead of the one being 
+    # yielded (0 to validate each batch in turn instead)
+    genny = _generator_for(modeltype, **validation_options)
+    if genny is None:
+        return
+    
+    depth = config.VALIDATION_PIPELINE_DEPTH
+    pending = deque()
+    records = genny.iter_generate(modeltype, model_stream, **validation_options)
+    for batch in _batches(records, config.VALIDATION_BATCH_RECORDS):
+        if depth <= 0:
+            for validated in _validate_batch(batch, **validation_options):
+                yield validated
+            continue
+        
+        pending.append(_get_async_pool().apply_async(_validate_batch, (batch,), validation_options))
+        while len(pending) > depth:
+            for validated in pending.popleft().get():
+                yield validated
+    
+    while len(pending) > 0:
+        for validated in pending.popleft().get():
+            yield validated
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+def _validate_batch(records, **validation_options):
+    fieldsets = [fs for record in records for fs in record]
+    if len(fieldsets) > 0:
+        _validate_values(fieldsets, **validation_options)
+        for fieldset in fieldsets:
+            _cross_reference(fieldset, **validation_options)
+    return records
+
+
+class AsyncValidation(object):
+    """
+    The result of async_validate_fieldset/async_validate_model: get() waits 
+    for the validation to finish and returns the validated fieldset(s), or
+    raises the exception that stopped it (or that the callback raised)
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+    
+    def ready(self):
+        return self._done.is_set()
+    
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+    
+    def get(self, timeout=None):
+        self._done.wait(timeout)
+        if not self._done.is_set():
+            raise TimeoutError
+        if self._error is not None:
+            raise self._error
+        return self._value
+    
+    def _set(self, value, error=None):
+        if error is None and self.callback is not None:
+            try:
+                self.callback(value)
+            except Exception as e:
+                error = e
+        self._value = value
+        self._error = error
+        self._done.set()
+
+def async_validate_fieldset(fieldset, callback=None, **validation_options):
+    # validate the fieldset in the background, returning an AsyncValidation
+    # whose get() gives back the validated fieldset.  The callback, if 
+    # supplied, is called with the fieldset when it is done
+    result = AsyncValidation(callback)
+    _get_async_pool().apply_async(_async_validate, (lambda: [fieldset], fieldset, result), validation_options)
+    return result
+
+def async_validate_model(modeltype, model_stream, callback=None, **validation_options):
+    # as above, but for a whole model; get() on the result gives back the
+    # validated fieldsets
+    result = AsyncValidation(callback)
+    fieldsets = lambda: _generate_fieldsets(modeltype, model_stream, **validation_options)
+    _get_async_pool().apply_async(_async_validate, (fieldsets, None, result), validation_options)
+    return result
+
+def _async_validate(get_fieldsets, value, result, **validation_options):
+    # start validating the values of the fieldsets, and then cross-reference
+    # them on the pool once all the responses are in.  Validators with 
+    # async_realism hand their lookups to remote's request pool rather than 
+    # holding a validation thread while they wait; the rest are run on the
+    # pool.  The thread running this is only held until the lookups have been
+    # started
+    try:
+        fieldsets = get_fieldsets()
+        jobs = _jobs(fieldsets)
+        columns = _columns(jobs)
+        if validation_options.get("prefetch", True):
+            _prefetch(columns, **validation_options)
+    except Exception as e:
+        result._set(None, e)
+        return
+    
+    responses = {} # (datatype, value) -> [response from each validator]
+    pending = []
+    for datatype, values in columns.iteritems():
+        validators = _validators_for(datatype, **validation_options)
+        for v in values:
+            responses[(datatype, v)] = [None] * len(validators)
+            for i, (name, validator) in enumerate(validators):
+                pending.append((datatype, v, i, name, validator))
+    
+    lock = threading.Lock()
+    remaining = [len(pending)]
+    errors = []
+    
+    def finish():
+        try:
+            if len(errors) > 0:
+                raise errors[0]
+            for fieldset, field, datatype, v in jobs:
+                fieldset.results(field, v, responses[(datatype, v)])
+            for fieldset in fieldsets:
+                _cross_reference(fieldset, **validation_options)
+        except Exception as e:
+            result._set(None, e)
+            return
+        result._set(value if value is not None else fieldsets)
+    
+    def collector(datatype, v, i, name):
+        def collect(response, error=None):
+            if error is None:
+                try:
+                    response.provenance = name
+                    responses[(datatype, v)][i] = response
+                except Exception as e:
+                    error = e
+            if error is not None:
+                errors.append(error)
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                _get_pool().apply_async(finish)
+        return collect
+    
+    if len(pending) == 0:
+        finish()
+        return
+    for datatype, v, i, name, validator in pending:
+        collect = collector(datatype, v, i, name)
+        if getattr(validator, "async_realism", False):
+            try:
+                validator.validate_async(datatype, v, collect, **validation_options)
+            except Exception as e:
+                collect(None, e)
+        else:
+            _get_pool().apply_async(plugin.respond, (collect, validator.validate, datatype, v), validation_options)
+
 def model2dict(modeltype, model_stream, **validation_options):
     fieldsets = _generate_fieldsets(modeltype, model_stream, **validation_options)
     
@@ -114,9 +473,14 @@ def model2json(modeltype, model_stream, indent=None, **validation_options):
 
 
 def _generate_fieldsets(modeltype, model_stream, **validation_options):
+    genny = _generator_for(modeltype, **validation_options)
+    if genny is not None:
+        return genny.generate(modeltype, model_stream, **validation_options)
+
+def _generator_for(modeltype, **validation_options):
     for name, genny in generators.iteritems():
         if genny.supports(modeltype, **validation_options):
-            return genny.generate(modeltype, model_stream, **validation_options)
+            return genny
 
 
 def fieldsets_to_html(fieldsets):
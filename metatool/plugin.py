@@ -1,14 +1,20 @@
-import imp, os, json
+import imp, os, json, threading
 import config
-from copy import deepcopy
 
 
 MODULE_EXTENSIONS = ('.py',) # only interested in .py files, not pyc or pyo
 
 class Validator(object):
+    # subclasses may list the (lower case) datatypes they handle here, which
+    # allows them to be dispatched by a lookup on the datatype rather than by
+    # calling supports() on every plugin.  Leave as None to rely on supports()
+    datatypes = None
+    
     # subclasses should override these methods with their implementations
     def supports(self, datatype, **validation_options):
-        raise NotImplementedError
+        if self.datatypes is None:
+            raise NotImplementedError
+        return datatype.lower() in self.datatypes
         
     def validate(self, datatype, value, **validation_options):
         raise NotImplementedError
@@ -19,13 +25,73 @@ class Validator(object):
     def validate_realism(self, datatype, value, **validation_options):
         raise NotImplementedError
     
+    def validate_column(self, datatype, values, **validation_options):
+        # validate a list of values of the same datatype, returning a response
+        # for each.  Subclasses which can check many values more cheaply than
+        # one at a time should override this; by default it just loops
+        return [self.validate(datatype, value, **validation_options) for value in values]
+    
+    def prefetch(self, datatype, values, **validation_options):
+        # called with all the values of a datatype which are about to be
+        # validated one by one, so that subclasses which can look many values
+        # up in one go may do so in advance.  Does nothing by default
+        pass
+    
+    # subclasses which check the realism of values remotely may set this and
+    # implement validate_realism_async, so that the asynchronous validations
+    # don't hold a thread while they wait for the remote service
+    async_realism = False
+    
+    def validate_realism_async(self, datatype, value, callback, **validation_options):
+        # as validate_realism, but returns at once, and the response (or the
+        # exception raised getting it) is passed to callback(response, error)
+        # when it is ready.  Requests should be made with remote.get_async or
+        # remote.lookup_async, and the callback called with respond()
+        raise NotImplementedError
+    
+    def validate_async(self, datatype, value, callback, **validation_options):
+        # as validate, but passing the response to callback(response, error).
+        # The format is checked before returning, and the realism afterwards
+        # if async_realism is set; otherwise this just calls validate
+        if not self.async_realism:
+            respond(callback, self.validate, datatype, value, **validation_options)
+            return
+        r = ValidationResponse()
+        try:
+            self.validate_format(datatype, value, validation_response=r, **validation_options)
+        except Exception as e:
+            callback(None, e)
+            return
+        self.validate_realism_async(datatype, value, callback, validation_response=r, **validation_options)
+
+def respond(callback, f, *args, **kwargs):
+    # pass the result of f(*args, **kwargs) to callback(response, error), or
+    # the exception it raises
+    try:
+        response = f(*args, **kwargs)
+    except Exception as e:
+        callback(None, e)
+        return
+    callback(response, None)
+
+def _message(message):
+    # the same fixed messages are reported for very many values, so keep one
+    # copy of each (only byte strings can be interned)
+    if type(message) is str:
+        return intern(message)
+    return message
+
 class ValidationResponse(object):
+    # the message lists are only created when there is something to put in 
+    # them, as most responses only use one or two of them
+    __slots__ = ("_info", "_warn", "_error", "_correction", "_alternative", "data", "provenance")
+    
     def __init__(self):
-        self._info = []
-        self._warn = []
-        self._error = []
-        self._correction = []
-        self._alternative = []
+        self._info = None
+        self._warn = None
+        self._error = None
+        self._correction = None
+        self._alternative = None
         
         # write to this directly if you have some data from some service
         # which might be useful to the validator later
@@ -36,49 +102,59 @@ class ValidationResponse(object):
         self.provenance = None
         
     def info(self, info):
-        self._info.append(info)
+        if self._info is None:
+            self._info = []
+        self._info.append(_message(info))
     
     def get_info(self):
-        return self._info
+        return self._info if self._info is not None else []
     
     def warn(self, warn):
-        self._warn.append(warn)
+        if self._warn is None:
+            self._warn = []
+        self._warn.append(_message(warn))
         
     def get_warn(self):
-        return self._warn
+        return self._warn if self._warn is not None else []
     
     def has_warnings(self):
-        return len(self._warn) > 0
+        return self._warn is not None and len(self._warn) > 0
     
     def error(self, error):
-        self._error.append(error)
+        if self._error is None:
+            self._error = []
+        self._error.append(_message(error))
     
     def get_error(self):
-        return self._error
+        return self._error if self._error is not None else []
         
     def has_errors(self):
-        return len(self._error) > 0
+        return self._error is not None and len(self._error) > 0
     
     def correction(self, correction):
+        if self._correction is None:
+            self._correction = []
         self._correction.append(correction)
         
     def get_corrections(self):
-        return self._correction
+        return self._correction if self._correction is not None else []
         
     def get_alternatives(self):
-        return self._alternative
+        return self._alternative if self._alternative is not None else []
     
     def alternative(self, alt):
+        if self._alternative is None:
+            self._alternative = []
         self._alternative.append(alt)
     
     def as_dict(self):
         desc = {
             "provenance" : self.provenance,
-            "info" : self._info,
-            "warn" : self._warn,
-            "error" : self._error,
-            "correction" :  self._correction,
-            "alternative" : self._alternative
+            "info" : self.get_info(),
+            "warn" : self.get_warn(),
+            "error" : self.get_error(),
+            "correction" :  self.get_corrections(),
+            "alternative" : self.get_alternatives()
         }
         return desc
     
@@ -98,33 +174,47 @@ class DataWrapper(object):
         
 
 class Comparator(object):
+    # subclasses may list the (lower case) crossref names they can compare
+    # here, in the same way as for Validator.datatypes
+    datatypes = None
+    
+    # the relative cost of a comparison.  Comparators are tried cheapest first,
+    # so subclasses doing more than a simple equality test should raise this
+    cost = 10
+    
     # subclasses should override these methods with their implementations
     def supports(self, datatype, **comparison_options):
-        raise NotImplementedError
+        if self.datatypes is None:
+            raise NotImplementedError
+        return datatype.lower() in self.datatypes
     
     def compare(self, datatype, original, comparison, **comparison_options):
         raise NotImplementedError
         
 
 class ComparisonResponse(object):
+    __slots__ = ("success", "comparator", "data_source", "_correction", "compared_with")
+    
     def __init__(self):
         self.success = False
         self.comparator = None
         self.data_source = None
-        self._correction = []
+        self._correction = None
         self.compared_with = None
     
     def correction(self, correction):
+        if self._correction is None:
+            self._correction = []
         self._correction.append(correction)
     
     def get_corrections(self):
-        return self._correction
+        return self._correction if self._correction is not None else []
     
     def as_dict(self):
         desc = {
             "success" : self.success,
             "comparator" : self.comparator,
-            "correction" : self._correction,
+            "correction" : self.get_corrections(),
             "data_source" : self.data_source,
             "compared_with" :  self.compared_with
         }
@@ -138,120 +228,186 @@ class ComparisonResponse(object):
             return json.dumps(desc, indent=indent)
 
 class Generator(object):
+    # subclasses may list the (lower case) modeltypes they handle here, which
+    # allows the registry to select them without importing the plugin module
+    modeltypes = None
+    
     # subclasses should override these methods with their implementations
     def supports(self, modeltype, **generator_options):
-        raise NotImplementedError
+        if self.modeltypes is None:
+            raise NotImplementedError
+        return modeltype.lower() in self.modeltypes
         
     def generate(self, modeltype, model_stream, **generator_options):
         raise NotImplementedError
+    
+    def iter_generate(self, modeltype, model_stream, **generator_options):
+        # yield the list of fieldsets for each record in the model in turn.
+        # Subclasses whose models hold many records should override this to
+        # yield each as soon as it has been read, so that validation can 
+        # start on it while the rest are read; by default the model is a 
+        # single record
+        yield self.generate(modeltype, model_stream, **generator_options)
+
+class Field(object):
+    """
+    One field of a FieldSet.  The validation, comparison and additional dicts
+    are only created when something is put in them, and the set used to keep
+    the values distinct only when values are added one at a time
+    """
+    __slots__ = ("datatype", "crossref", "values", "validation", "comparison", "additional", "_distinct")
+    
+    def __init__(self):
+        self.datatype = None
+        self.crossref = None
+        self.values = []
+        self.validation = None
+        self.comparison = None
+        self.additional = None
+        self._distinct = None
+    
+    def add(self, value):
+        if self._distinct is None:
+            self._distinct = set(self.values)
+        if value not in self._distinct:
+            self._distinct.add(value)
+            self.values.append(value)
+    
+    def set_values(self, values):
+        self.values = values
+        self._distinct = None
+    
+    def as_dict(self):
+        return {
+            "datatype" : self.datatype,
+            "values" : list(self.values),
+            "crossref" : self.crossref,
+            "validation" : self._responses_dict(self.validation),
+            "comparison" : self._responses_dict(self.comparison),
+            "additional" : dict([(k, list(v)) for k, v in self.additional.iteritems()]) if self.additional is not None else {}
+        }
+    
+    def _responses_dict(self, responses):
+        if responses is None:
+            return {}
+        return dict([(value, [r.as_dict() for r in resps]) for value, resps in responses.iteritems()])
 
 class FieldSet(object):
+    __slots__ = ("fieldset",)
+    
     def __init__(self):
+        # field name -> Field
         self.fieldset = {}
         
     def add(self, field_name, value):
-        self._ensure(field_name)
-        if value not in self.fieldset[field_name]["values"]:
-            self.fieldset[field_name]["values"].append(value)
-    
-    def datatype(self, field_name, datatype):
-        self._ensure(field_name)
-        self.fieldset[field_name]["datatype"] = datatype
-    
-    def crossref(self, field_name, crossref):
-        self._ensure(field_name)
-        self.fieldset[field_name]["crossref"] = crossref
+        self._ensure(field_name).add(value)
     
     def field(self, field_name, datatype, values, crossref=None):
         if type(values) != list:
             values = [values]
-        self._ensure(field_name)
-        self.fieldset[field_name]["datatype"] = datatype
-        self.fieldset[field_name]["values"] = values
+        f = self._ensure(field_name)
+        f.datatype = datatype
+        f.set_values(values)
         if crossref is not None:
-            self.fieldset[field_name]["crossref"] = crossref
+            f.crossref = crossref
     
     def fields(self):
         return self.fieldset.keys()
         
     def values(self, field_name):
-        return self.fieldset.get(field_name, {}).get("values", [])
+        f = self.fieldset.get(field_name)
+        return f.values if f is not None else []
         
     def datatype(self, field_name):
-        return self.fieldset.get(field_name, {}).get("datatype")
+        f = self.fieldset.get(field_name)
+        return f.datatype if f is not None else None
         
     def crossref(self, field_name):
-        return self.fieldset.get(field_name, {}).get("crossref")
+        f = self.fieldset.get(field_name)
+        return f.crossref if f is not None else None
     
     def get_validations(self, field_name, value):
-        return self.fieldset.get(field_name, {}).get("validation", {}).get(value, [])
+        f = self.fieldset.get(field_name)
+        if f is None or f.validation is None:
+            return []
+        return f.validation.get(value, [])
     
     def get_comparisons(self, field_name, value):
-        return self.fieldset.get(field_name, {}).get("comparison", {}).get(value) # return a None if there were no comparisons
+        f = self.fieldset.get(field_name)
+        if f is None or f.comparison is None:
+            return None # return a None if there were no comparisons
+        return f.comparison.get(value)
         
     def has_comparisons(self, field_name, value):
-        return value in self.fieldset.get(field_name, {}).get("comparison", {})
+        f = self.fieldset.get(field_name)
+        return f is not None and f.comparison is not None and value in f.comparison
     
     def comparisons(self, field_name, comparisons):
-        self._ensure(field_name)
-        self.fieldset[field_name]["comparison"] = comparisons
+        self._ensure(field_name).comparison = comparisons
         
     def additionals(self, field_name, additionals):
-        self._ensure(field_name)
-        self.fieldset[field_name]["additional"] = additionals
+        self._ensure(field_name).additional = additionals
     
     def results(self, field_name, value, results):
-        self._ensure(field_name)
-        self.fieldset[field_name]["validation"][value] = results
+        f = self._ensure(field_name)
+        if f.validation is None:
+            f.validation = {}
+        f.validation[value] = results
     
     def get_crossref_data(self):
         cross_reference = []
-        for field, obj in self.fieldset.iteritems():
-            for value, validation_results in obj.get("validation", {}).iteritems():
+        for field, f in self.fieldset.iteritems():
+            if f.validation is None:
+                continue
+            for value, validation_results in f.validation.iteritems():
                 for r in validation_results:
                     if r.data is not None and isinstance(r.data, DataWrapper):
                         cross_reference.append(r.data)
         return cross_reference
     
     def _ensure(self, field_name):
-        if field_name not in self.fieldset:
-            self.fieldset[field_name] = {
-                "datatype" : None, 
-                "values" : [], 
-                "crossref" : None, 
-                "validation" : {},
-                "comparison" : {},
-                "additional" : {}
-            }
+        f = self.fieldset.get(field_name)
+        if f is None:
+            f = Field()
+            self.fieldset[field_name] = f
+        return f
     
     def as_dict(self):
-        j = deepcopy(self.fieldset)
-        for field_name in j.keys():
-            cvalues = j.get(field_name, {}).get("comparison", {}).keys()
-            for v in cvalues:
-                resps = j.get(field_name, {}).get("comparison", {}).get(v, [])
-                rjs = []
-                for r in resps:
-                    rj = r.as_dict()
-                    rjs.append(rj)
-                j[field_name]["comparison"][v] = rjs
-            vvalues = j.get(field_name, {}).get("validation", {}).keys()
-            for v in vvalues:
-                resps = j.get(field_name, {}).get("validation", {}).get(v, [])
-                rjs = []
-                for r in resps:
-                    rj = r.as_dict()
-                    rjs.append(rj)
-                j[field_name]["validation"][v] = rjs
-        return j
+        return dict([(field_name, f.as_dict()) for field_name, f in self.fieldset.iteritems()])
 
 class NodeMaker(object):
-    def supports(self):
-        raise NotImplementedError
+    # as for Generator
+    modeltypes = None
+    
+    def supports(self, modeltype, **nodemaker_options):
+        if self.modeltypes is None:
+            raise NotImplementedError
+        return modeltype.lower() in self.modeltypes
     
     def get_nodes(self, modeltype, model_stream, **nodemaker_options):
         raise NotImplementedError
 
+def index_by_datatype(plugin_instances):
+    # split the plugins into an index of lower case datatype -> [(name, plugin)]
+    # for those that declare their datatypes, and a dict of the rest, which
+    # must still be asked whether they support a datatype
+    index = {}
+    undeclared = {}
+    for name, p in plugin_instances.iteritems():
+        datatypes = getattr(p, "datatypes", None)
+        if datatypes is None:
+            undeclared[name] = p
+            continue
+        for datatype in datatypes:
+            lower = datatype.lower()
+            if lower not in index:
+                index[lower] = []
+            index[lower].append((name, p))
+    return index, undeclared
+
+# the plugin roles which are discovered in the plugins directory
+ROLES = [Validator, Comparator, Generator, NodeMaker]
+
 def load_validators():
     return _load(Validator)
 
@@ -265,49 +421,163 @@ def load_nodemakers():
     return _load(NodeMaker)
 
 def _load(klazz):
-    # load the plugins from the plugin directory
+    # copy, so that callers can add to or remove from their registry without
+    # affecting anyone else's
+    return dict(_discover()[klazz.__name__])
+
+# role name -> {plugin name -> plugin instance}, populated once per process
+_discovered = None
+
+# plugin module name -> imported module, for modules loaded lazily
+_modules = {}
+_modules_lock = threading.RLock()
+
+class LazyPlugin(object):
+    """
+    Stands in for a plugin instance whose module has not been imported yet.  The
+    datatypes/modeltypes it declares (and a comparator's cost) are known from
+    the plugin manifest, so it can be indexed, ordered and asked whether it
+    supports something without importing anything; the module is only 
+    imported when the plugin is actually used
+    """
+    def __init__(self, module_name, class_name, datatypes=None, modeltypes=None, cost=None):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.datatypes = datatypes
+        self.modeltypes = modeltypes
+        if cost is not None:
+            self.cost = cost
+        self._instance = None
+    
+    def supports(self, name, **options):
+        declared = self.datatypes if self.datatypes is not None else self.modeltypes
+        if declared is None:
+            return self.instance().supports(name, **options)
+        return name.lower() in declared
+    
+    def instance(self):
+        if self._instance is None:
+            with _modules_lock:
+                if self._instance is None:
+                    mod = _import_plugin_module(self.module_name)
+                    self._instance = getattr(mod, self.class_name)()
+        return self._instance
+    
+    def __getattr__(self, attr):
+        # only called for attributes the proxy does not have itself
+        return getattr(self.instance(), attr)
+
+def _import_plugin_module(name):
+    with _modules_lock:
+        if name not in _modules:
+            _modules[name] = imp.load_source(name, os.path.join(_plugin_dir(), name + ".py"))
+        return _modules[name]
+
+def _discover():
+    global _discovered
+    if _discovered is None:
+        _discovered = _load_manifest()
+        if _discovered is None:
+            _discovered = _load_all()
+    return _discovered
+
+def _plugin_dir():
     thisfile_dir = os.path.dirname(os.path.realpath(__file__))  # actual directory, not CWD (current working directory)
-    plugin_dir = os.path.join(thisfile_dir, 'plugins')
-    names = [os.path.splitext(module)[0] for module in os.listdir(plugin_dir) if module.endswith(MODULE_EXTENSIONS) and module != "__init__.py"]
-    plugin_instances = {}
-    for name in names:
-        mod = imp.load_source(name, os.path.join(plugin_dir, name + ".py"))
+    return os.path.join(thisfile_dir, 'plugins')
+
+def _load_all():
+    # load the plugins from the plugin directory, importing each module only
+    # once and sorting every class it contains into the roles it can play
+    plugin_dir = _plugin_dir()
+    discovered = dict([(role.__name__, {}) for role in ROLES])
+    manifest = {"modules" : {}}
+    for name in _module_names(plugin_dir):
+        path = os.path.join(plugin_dir, name + ".py")
+        mod = _import_plugin_module(name)
+        classes = {}
         members = dir(mod)
         for member in members:
             attr = getattr(mod, member)
-            if isinstance(attr, type):
-                if issubclass(attr, klazz):
-                    plugin_instances[name + "." + attr.__name__] = attr()
-    return plugin_instances
+            if not isinstance(attr, type):
+                continue
+            roles = [role.__name__ for role in ROLES if issubclass(attr, role)]
+            if len(roles) == 0:
+                continue
+            instance = attr()
+            for role in roles:
+                discovered[role][name + "." + attr.__name__] = instance
+            classes[member] = {
+                "roles" : roles,
+                "datatypes" : getattr(attr, "datatypes", None),
+                "modeltypes" : getattr(attr, "modeltypes", None),
+                "cost" : getattr(attr, "cost", None)
+            }
+        manifest["modules"][name] = {"mtime" : os.path.getmtime(path), "classes" : classes}
+    _save_manifest(manifest)
+    return discovered
 
+def _module_names(plugin_dir):
+    return [os.path.splitext(module)[0] for module in os.listdir(plugin_dir) if module.endswith(MODULE_EXTENSIONS) and module != "__init__.py"]
 
-def _loadold(klazz):
-    plugin_instances = {}
-    modules = get_modules("metatool.plugins")
-    for modname, modpath in modules:
-        mod = imp.load_source(modname, os.path.join(modpath, modname + ".py"))
-        members = dir(mod)
-        for member in members:
-            attr = getattr(mod, member)
-            if isinstance(attr, type):
-                if issubclass(attr, klazz):
-                    plugin_instances[modname + "." + attr.__name__] = attr()
-    return plugin_instances
+def _load_manifest():
+    # if a manifest has been configured and none of the plugins have changed
+    # since it was written, we can instantiate the listed classes directly
+    # (or lazily), without scanning or introspecting anything
+    path = _manifest_path()
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            manifest = json.loads(f.read())
+        # only the .py files are compared, as the directory itself changes
+        # whenever the modules are compiled
+        plugin_dir = _plugin_dir()
+        if set(_module_names(plugin_dir)) != set(manifest.get("modules", {}).keys()):
+            return None
+        for name, entry in manifest.get("modules", {}).iteritems():
+            if os.path.getmtime(os.path.join(plugin_dir, name + ".py")) != entry.get("mtime"):
+                return None
+            for member, info in entry.get("classes", {}).iteritems():
+                if not isinstance(info, dict) or "cost" not in info:
+                    return None # written by an older version of the loader
+    except (IOError, OSError, ValueError):
+        return None
+    
+    lazy = getattr(config, "PLUGIN_LAZY_LOAD", False)
+    discovered = dict([(role.__name__, {}) for role in ROLES])
+    for name, entry in manifest.get("modules", {}).iteritems():
+        name = str(name)
+        for member, info in entry.get("classes", {}).iteritems():
+            member = str(member)
+            if lazy:
+                instance = LazyPlugin(name, member, _strs(info.get("datatypes")), _strs(info.get("modeltypes")), info.get("cost"))
+            else:
+                instance = getattr(_import_plugin_module(name), member)()
+            for role in info.get("roles", []):
+                discovered[str(role)][name + "." + member] = instance
+    return discovered
 
-def get_modules(package_heirarchy):
-    bits = package_heirarchy.split(".")
-    parent_path = None
-    file = path = description = None
-    for bit in bits:
-        file, path, description = imp.find_module(bit, parent_path)
-        mod = imp.load_module(bit, file, path, description)
-        parent_path = mod.__path__
-    
-    # file, pathname, description = imp.find_module(package_name)
-    if file:
-        raise ImportError('Not a package: %r', package_heirarchy)
-        
-    # Use a set because some may be both source and compiled.
-    return [(os.path.splitext(module)[0], path)
-        for module in os.listdir(path)
-        if module.endswith(MODULE_EXTENSIONS) and module != "__init__.py"]
+def _strs(l):
+    if l is None:
+        return None
+    return [str(s) for s in l]
+
+def _manifest_path():
+    path = getattr(config, "PLUGIN_MANIFEST", None)
+    if path is None:
+        return None
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), path)
+
+def _save_manifest(manifest):
+    path = _manifest_path()
+    if path is None:
+        return
+    # write to a temporary file and move it into place, so that concurrently
+    # starting workers never see a half-written manifest
+    try:
+        tmp = path + "." + str(os.getpid())
+        with open(tmp, "w") as f:
+            f.write(json.dumps(manifest))
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        pass
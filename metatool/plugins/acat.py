@@ -3,15 +3,352 @@ try:
 except ImportError:
     import plugin as plugin
 
-import catflap
+try:
+    from metatool import config
+except ImportError:
+    import config
+
+try:
+    from metatool import cache
+except ImportError:
+    import cache
+
+try:
+    from metatool import remote
+except ImportError:
+    import remote
+
+try:
+    from metatool.plugins import text
+except ImportError:
+    from plugins import text
+
+import catflap, json, os, threading, time
+from collections import OrderedDict
+
+# ("issn"|"journal_title", normalised value) -> [journals], from batched searches
+_prefetched = cache.MemoryCache(config.ACAT_PREFETCH_MAX_ENTRIES, default_ttl=config.ACAT_PREFETCH_TTL)
+
+# without a snapshot, the titles of the journals the ACAT has returned, to 
+# suggest from: normalised title -> [title], least recently seen first, and
+# an index of the normalised titles
+_seen = OrderedDict()
+_seen_titles = text.NGramIndex()
+_seen_lock = threading.Lock()
 
 def search(issn=[], journal_title=[]):
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        journals = snapshot.search(issn, journal_title)
+        if len(journals) > 0 or len(issn) > 0 or config.ACAT_SNAPSHOT_ONLY:
+            return journals
+        # title searches in the ACAT are looser than the exact matches in the
+        # snapshot, so it's worth asking it about titles we don't have
+        try:
+            return catflap.Journal.search(journal_title=journal_title)
+        except:
+            return journals
+    
     if len(issn) > 0:
-        return catflap.Journal.search(issn=issn)
+        if len(issn) == 1:
+            journals = _prefetched.get("issn", _normalise_issn(issn[0]))
+            if journals is not None:
+                return journals
+        return _journal_search(issn=issn)
     elif len(journal_title) > 0:
-        return catflap.Journal.search(journal_title=journal_title)
+        if len(journal_title) == 1:
+            journals = _prefetched.get("journal_title", _normalise_title(journal_title[0]))
+            if journals is not None:
+                return journals
+        return _journal_search(journal_title=journal_title)
     return None
 
+def _journal_search(**kwargs):
+    journals = catflap.Journal.search(**kwargs)
+    _remember(journals)
+    return journals
+
+def _remember(journals):
+    # add the journals' titles to those we can suggest without a snapshot, 
+    # forgetting the least recently seen beyond config.ACAT_SEEN_TITLES
+    with _seen_lock:
+        for journal in journals:
+            for title in journal.data.get("journal_name", []):
+                normalised = _normalise_title(title)
+                titles = _seen.pop(normalised, None)
+                if titles is None:
+                    titles = []
+                    _seen_titles.add(normalised)
+                if title not in titles:
+                    titles.append(title)
+                _seen[normalised] = titles
+        while len(_seen) > config.ACAT_SEEN_TITLES:
+            normalised, titles = _seen.popitem(last=False)
+            _seen_titles.remove(normalised)
+
+def similar_titles(journal_title, k=None, threshold=None):
+    # the titles of journals in the ACAT snapshot which are most like the given
+    # one, for suggesting when it can't be found.  Without a snapshot, only 
+    # the titles of the journals which searches have already returned can be
+    # suggested
+    k = k if k is not None else config.ACAT_SUGGESTIONS
+    threshold = threshold if threshold is not None else config.ACAT_SUGGESTION_THRESHOLD
+    titles = []
+    snapshot = get_snapshot()
+    if snapshot is None:
+        with _seen_lock:
+            for normalised, ratio in _seen_titles.similar(journal_title, k, threshold):
+                titles += [t for t in _seen.get(normalised, []) if t not in titles]
+        return titles
+    for normalised, ratio in snapshot.titles.similar(journal_title, k, threshold):
+        for journal in snapshot.by_title.get(normalised, []):
+            titles += [t for t in journal.data["journal_name"] if _normalise_title(t) == normalised and t not in titles]
+    return titles
+
+def prefetch(issn=[], journal_title=[]):
+    # search for all the ISSNs and journal titles with one catflap search per
+    # chunk of config.ACAT_BATCH_SIZE, and share the results out between the
+    # values whose (normalised) ISSN or title they have, so that a subsequent
+    # search() for any one of them is answered from here.  Values which are
+    # not found that way (e.g. titles that catflap only matched loosely) are
+    # left to be searched for on their own
+    if get_snapshot() is not None:
+        return
+    for field, values, normalise in [("issn", issn, _normalise_issn), ("journal_title", journal_title, _normalise_title)]:
+        unfetched = _unfetched(field, values, normalise)
+        for i in range(0, len(unfetched), config.ACAT_BATCH_SIZE):
+            chunk = unfetched[i:i + config.ACAT_BATCH_SIZE]
+            journals = _batch_search(field, chunk)
+            if journals is None:
+                continue
+            found = {}
+            for journal in journals:
+                names = journal.data["issn"] if field == "issn" else journal.data["journal_name"]
+                for n in set([normalise(x) for x in names]):
+                    found.setdefault(n, []).append(journal)
+            for value in chunk:
+                if value in found:
+                    _prefetched.set(field, value, found[value])
+
+def _batch_search(field, values):
+    # the journals with any of the values in the field, from one catflap 
+    # search, or None if it fails (in which case the values will just be 
+    # searched for one at a time instead)
+    try:
+        if field == "issn":
+            return _journal_search(issn=values)
+        return _journal_search(journal_title=values)
+    except Exception:
+        return None
+
+def _unfetched(field, values, normalise):
+    # the distinct normalised values we have no results for yet
+    unfetched = []
+    seen = set()
+    for v in values:
+        n = normalise(v)
+        if n not in seen and _prefetched.get(field, n) is None:
+            unfetched.append(n)
+        seen.add(n)
+    return unfetched
+
+class SnapshotError(Exception):
+    pass
+
+class SnapshotJournal(object):
+    # just the parts of an ACAT journal record that we use, in the same shape
+    # as the catflap journals
+    def __init__(self, data):
+        self.data = {"issn" : data.get("issn", []), "journal_name" : data.get("journal_name", [])}
+
+class JournalSnapshot(object):
+    """
+    A local copy of the ACAT journal index, held as maps from normalised ISSN 
+    and normalised journal title to the journals which have them, so that 
+    searches can be answered without going to the ACAT
+    """
+    def __init__(self):
+        self.journals = {}  # id -> SnapshotJournal
+        self.by_issn = {}
+        self.by_title = {}
+        self.titles = text.NGramIndex()
+        self.updated = None # time of the last load/refresh from the ACAT
+    
+    def search(self, issn=[], journal_title=[]):
+        found = []
+        if len(issn) > 0:
+            for i in issn:
+                found += [j for j in self.by_issn.get(_normalise_issn(i), []) if j not in found]
+        elif len(journal_title) > 0:
+            for t in journal_title:
+                found += [j for j in self.by_title.get(_normalise_title(t), []) if j not in found]
+        return found
+    
+    def add(self, id, data):
+        self.remove(id)
+        journal = SnapshotJournal(data)
+        self.journals[id] = journal
+        for issn in set([_normalise_issn(i) for i in journal.data["issn"]]):
+            self.by_issn.setdefault(issn, []).append(journal)
+        for title in set([_normalise_title(t) for t in journal.data["journal_name"]]):
+            self.by_title.setdefault(title, []).append(journal)
+            self.titles.add(title)
+    
+    def remove(self, id):
+        journal = self.journals.pop(id, None)
+        if journal is None:
+            return
+        for issn in set([_normalise_issn(i) for i in journal.data["issn"]]):
+            self.by_issn[issn].remove(journal)
+            if len(self.by_issn[issn]) == 0:
+                del self.by_issn[issn]
+        for title in set([_normalise_title(t) for t in journal.data["journal_name"]]):
+            self.by_title[title].remove(journal)
+            if len(self.by_title[title]) == 0:
+                del self.by_title[title]
+                self.titles.remove(title)
+    
+    def load(self, since=None):
+        # page through the ACAT journal index, taking all the records or just 
+        # those updated since the given time
+        started = time.time()
+        query = {"query" : {"match_all" : {}}}
+        if since is not None:
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(since))
+            query = {"query" : {"range" : {config.ACAT_UPDATED_FIELD : {"gte" : stamp}}}}
+        
+        url = config.ACAT_JOURNAL_INDEX + "/_search?search_type=scan&scroll=5m&size=" + str(config.ACAT_SNAPSHOT_PAGE_SIZE)
+        scroll_id = self._page(url, json.dumps(query)).get("_scroll_id")
+        if scroll_id is None:
+            raise SnapshotError("No scroll id in the response to the scan of " + config.ACAT_JOURNAL_INDEX)
+        while scroll_id is not None:
+            url = config.ACAT_ES_HOST + "/_search/scroll?scroll=5m"
+            page = self._page(url, scroll_id)
+            hits = page.get("hits", {}).get("hits", [])
+            if len(hits) == 0:
+                break
+            for hit in hits:
+                self.add(hit.get("_id"), hit.get("_source", {}))
+            scroll_id = page.get("_scroll_id")
+        self.updated = started
+    
+    def _page(self, url, data):
+        # a page of the scan, which must be complete for the snapshot to be
+        # used, so anything else is an error
+        resp = remote.get(url, data=data, timeout=config.ACAT_SNAPSHOT_TIMEOUT)
+        if resp.status_code >= 400:
+            raise SnapshotError("The ACAT responded with " + str(resp.status_code) + " to " + url)
+        page = json.loads(resp.text)
+        if page.get("error") is not None or page.get("_shards", {}).get("failed", 0) > 0:
+            raise SnapshotError("The ACAT could not complete the search at " + url)
+        return page
+    
+    def refresh(self):
+        # pick up the records changed since we last looked (journals deleted
+        # from the ACAT need a full load to disappear)
+        self.load(since=self.updated)
+    
+    def save(self, path):
+        data = {"updated" : self.updated, "journals" : dict([(id, j.data) for id, j in self.journals.iteritems()])}
+        tmp = path + "." + str(os.getpid())
+        with open(tmp, "w") as f:
+            f.write(json.dumps(data))
+        os.rename(tmp, path)
+    
+    def copy(self):
+        snapshot = JournalSnapshot()
+        for id, journal in self.journals.iteritems():
+            snapshot.add(id, journal.data)
+        snapshot.updated = self.updated
+        return snapshot
+    
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            data = json.loads(f.read())
+        snapshot = cls()
+        for id, journal in data.get("journals", {}).iteritems():
+            snapshot.add(id, journal)
+        snapshot.updated = data.get("updated")
+        return snapshot
+
+# the snapshot in use, if config.ACAT_SNAPSHOT is set
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_snapshot_file_read = False
+
+# the thread loading or refreshing the snapshot, if there is one running, and
+# the time the last attempt to do so failed
+_updater = None
+_update_failed = None
+
+def get_snapshot():
+    # start with the saved snapshot, if there is one, so that we can work while
+    # the ACAT is unreachable.  Loading the snapshot from the ACAT (if there
+    # was no file) and refreshing it when it gets old is done in the
+    # background, and until that has finished the snapshot we have (if any)
+    # is used.  Failed attempts are retried after config.ACAT_SNAPSHOT_RETRY
+    global _snapshot, _snapshot_file_read, _updater
+    if not config.ACAT_SNAPSHOT:
+        return None
+    with _snapshot_lock:
+        if _snapshot is None and not _snapshot_file_read:
+            _snapshot_file_read = True
+            path = config.ACAT_SNAPSHOT_PATH
+            if path is not None and os.path.exists(path):
+                try:
+                    _snapshot = JournalSnapshot.from_file(path)
+                except Exception:
+                    pass
+        
+        now = time.time()
+        due = _snapshot is None or now - (_snapshot.updated or 0) > config.ACAT_SNAPSHOT_REFRESH
+        if due and _updater is None and (_update_failed is None or now - _update_failed > config.ACAT_SNAPSHOT_RETRY):
+            _updater = threading.Thread(target=_update_snapshot, args=(_snapshot,))
+            _updater.daemon = True
+            _updater.start()
+        return _snapshot
+
+def _update_snapshot(current):
+    # load or refresh a copy of the current snapshot, so that the current one
+    # can carry on being used meanwhile, and replace it with that
+    global _snapshot, _updater, _update_failed
+    try:
+        if current is None:
+            snapshot = JournalSnapshot()
+            snapshot.load()
+        else:
+            snapshot = current.copy()
+            snapshot.refresh()
+        _save_snapshot(snapshot)
+        with _snapshot_lock:
+            _snapshot = snapshot
+            _update_failed = None
+    except Exception:
+        # carry on with what we've got, if anything, and try again later
+        with _snapshot_lock:
+            _update_failed = time.time()
+    finally:
+        with _snapshot_lock:
+            _updater = None
+
+def _save_snapshot(snapshot):
+    if config.ACAT_SNAPSHOT_PATH is not None:
+        try:
+            snapshot.save(config.ACAT_SNAPSHOT_PATH)
+        except (IOError, OSError):
+            pass
+
+def _normalise_issn(issn):
+    # the hyphenated form, whether or not it was given hyphenated
+    issn = issn.strip().upper()
+    if len(issn) == 8 and "-" not in issn:
+        return issn[:4] + "-" + issn[4:]
+    return issn
+
+def _normalise_title(title):
+    return " ".join(title.lower().split())
+
 class ACATWrapper(plugin.DataWrapper):
     def __init__(self, journals):
         self.journals = journals
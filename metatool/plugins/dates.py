@@ -3,12 +3,49 @@ try:
 except ImportError:
     import plugin as plugin
 
+try:
+    from metatool import config
+except ImportError:
+    import config
+
+try:
+    from metatool import cache
+except ImportError:
+    import cache
+
 from dateutil import parser
+from datetime import date
+
+# the (dayfirst, yearfirst) readings of a date string which are compared
+INTERPRETATIONS = [(True, True), (True, False), (False, True), (False, False)]
+
+# the parsed interpretations of the date strings seen recently, shared by the
+# validator and the comparators
+_parsed = cache.memo("dates", config.DATE_PARSE_CACHE_SIZE)
+
+def parse(thedate):
+    # the datetime for each of the INTERPRETATIONS of the string, or None where
+    # it can't be read that way.  Parts missing from the string are taken from
+    # today's date, so the results are only remembered for today
+    key = (thedate, date.today().isoformat())
+    try:
+        parsed = _parsed.get("dates", key)
+    except TypeError:
+        # not something that can be remembered (or parsed)
+        return tuple([None] * len(INTERPRETATIONS))
+    if parsed is None:
+        parsed = tuple([_parse(thedate, dayfirst, yearfirst) for dayfirst, yearfirst in INTERPRETATIONS])
+        _parsed.set("dates", key, parsed)
+    return parsed
+
+def _parse(thedate, dayfirst, yearfirst):
+    try:
+        return parser.parse(thedate, dayfirst=dayfirst, yearfirst=yearfirst)
+    except:
+        return None
 
 class DateValidator(plugin.Validator):
-    def supports(self, datatype, *args, **kwargs):
-        lower = datatype.lower()
-        return lower in ["date"]
+    datatypes = ["date"]
     
     def validate(self, datatype, thedate, *args, **kwargs):
         r = plugin.ValidationResponse()
@@ -19,10 +56,10 @@ class DateValidator(plugin.Validator):
     
     def validate_format(self, datatype, thedate, *args, **kwargs):
         r = kwargs.get("validation_response", plugin.ValidationResponse())
-        try:
-            parsed_date = parser.parse(thedate)
+        # the default reading, neither day nor year first
+        if parse(thedate)[INTERPRETATIONS.index((False, False))] is not None:
             r.info("Date was successfully parsed")
-        except:
+        else:
             r.error("Unable to parse the supplied date")
         return r
     
@@ -31,67 +68,15 @@ class DateValidator(plugin.Validator):
         return r
 
 class DatesSimilar(plugin.Comparator):
-    def supports(self, datatype, **comparison_options):
-        return False
+    # only compares when subclassed with the datatypes to compare
+    datatypes = []
+    cost = 50
     
     def compare(self, datatype, original, comparison, **comparison_options):
         r = plugin.ComparisonResponse()
         
-        ods = []
-        try:
-            od1 = parser.parse(original, dayfirst=True, yearfirst=True)
-            ods.append(od1)
-        except:
-            pass
-        
-        try:
-            od2 = parser.parse(original, dayfirst=True, yearfirst=False)
-            ods.append(od2)
-        except:
-            pass
-        
-        try:
-            od3 = parser.parse(original, dayfirst=False, yearfirst=True)
-            ods.append(od3)
-        except:
-            pass
-        
-        try:
-            od4 = parser.parse(original, dayfirst=False, yearfirst=False)
-            ods.append(od4)
-        except:
-            pass
-        
-        cds = []
-        try:
-            cd1 = parser.parse(comparison, dayfirst=True, yearfirst=True)
-            cds.append(cd1)
-        except:
-            pass
-        
-        try:
-            cd2 = parser.parse(comparison, dayfirst=True, yearfirst=False)
-            cds.append(cd2)
-        except:
-            pass
-            
-        try:
-            cd3 = parser.parse(comparison, dayfirst=False, yearfirst=True)
-            cds.append(cd3)
-        except:
-            pass
-            
-        try:
-            cd4 = parser.parse(comparison, dayfirst=False, yearfirst=False)
-            cds.append(cd4)
-        except:
-            pass
-        
-        for od in ods:
-            for cd in cds:
-                if od == cd:
-                    r.success = True
-                    return r
-        
-        r.sucess = False
+        # the dates are similar if any reading of one is a reading of the other
+        ods = set([d for d in parse(original) if d is not None])
+        cds = set([d for d in parse(comparison) if d is not None])
+        r.success = len(ods & cds) > 0
         return r
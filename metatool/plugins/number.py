@@ -4,9 +4,7 @@ except ImportError:
     import plugin as plugin
 
 class IntegerValidator(plugin.Validator):
-    def supports(self, datatype, *args, **kwargs):
-        lower = datatype.lower()
-        return lower in ["integer"]
+    datatypes = ["integer"]
     
     def validate(self, datatype, number, *args, **kwargs):
         r = plugin.ValidationResponse()
@@ -38,8 +36,9 @@ class IntegerValidator(plugin.Validator):
         return r
 
 class IntegersEqual(plugin.Comparator):
-    def supports(self, datatype, **comparison_options):
-        return False
+    # only compares when subclassed with the datatypes to compare
+    datatypes = []
+    cost = 2
     
     def compare(self, datatype, original, comparison, **comparison_options):
         r = plugin.ComparisonResponse()
@@ -2,15 +2,18 @@ try:
     import metatool.plugin as plugin
 except ImportError:
     import plugin as plugin
-import orcid, re
+try:
+    from metatool import cache
+except ImportError:
+    import cache
+try:
+    from metatool import checksums
+except ImportError:
+    import checksums
+import orcid, json
 
 class ORCID(plugin.Validator):
-    rx_1 = "(\d{4}-\d{4}-\d{4}-\d{3}[0-9X])"
-    rx_2 = "(\d{15}[0-9X])"
-
-    def supports(self, datatype, **validation_options):
-        lower = datatype.lower()
-        return lower == "orcid"
+    datatypes = ["orcid"]
     
     def validate(self, datatype, value, *args, **validation_options):
         r = plugin.ValidationResponse()
@@ -22,10 +25,19 @@ class ORCID(plugin.Validator):
         return self.validate_realism(datatype, value, validation_response=r, oid=oid)
         
     def validate_format(self, datatype, value, *args, **validation_options):
-        r = kwargs.get("validation_response", plugin.ValidationResponse())
-        oid = self._format_validate(value, r)
+        r = validation_options.get("validation_response", plugin.ValidationResponse())
+        self._format_validate(value, r)
         return r
     
+    def validate_column(self, datatype, values, **validation_options):
+        # check the format of the whole column at once, then resolve each one
+        responses = []
+        for value, check in zip(values, checksums.check_orcids(values)):
+            r = plugin.ValidationResponse()
+            oid = self._format_validate(value, r, check)
+            responses.append(self.validate_realism(datatype, value, validation_response=r, oid=oid))
+        return responses
+    
     def validate_realism(self, datatype, value, *args, **kwargs):
         r = kwargs.get("validation_response", plugin.ValidationResponse())
         oid = kwargs.get("oid", None)
@@ -33,6 +45,12 @@ class ORCID(plugin.Validator):
         if oid is None:
             return r
         
+        # we may have resolved this orcid recently
+        cached = cache.get("orcid", oid)
+        if cached is not None:
+            r.data = ORCIDWrapper(json.loads(cached))
+            return r
+        
         # now make a request to the ORCID service to see if this orcid is
         # resolvable
         author = orcid.get(oid)
@@ -44,32 +62,25 @@ class ORCID(plugin.Validator):
             return r
         
         # save the data we got back from orcid in case it is useful to the validator
+        cache.set("orcid", oid, json.dumps(author._original_dict))
         r.data = ORCIDWrapper(author._original_dict)
         return r
     
-    def _format_validate(self, orcid_string, r):
+    def _format_validate(self, orcid_string, r, check=None):
         correction_required = False
         
-        # first let's see if there really is an orcid here, and validate it and correct it if necessary
-        corrected_id = None
-        m = re.search(self.rx_1, orcid_string)
-        if m is None:
-            m = re.search(self.rx_2, orcid_string)
-            if m is not None:
-                r.warn("Your orcid lacks hyphenation; preferred format for orcid is nnnn-nnnn-nnnn-nnnn")
-                corrected_id = self._correct(m.groups()[0])
-                correction_required = True
-                
-            else:
-                r.error("Your orcid could not be validated - format is incorrect")
-                return
-        
-        # get the properly formatted orcid
-        oid = m.groups()[0] if corrected_id is None else corrected_id
-        
-        # do the checksum
-        checksum = self._checksum(oid)
-        if checksum != oid[-1]:
+        # first let's see if there really is an orcid here, and validate it and correct it if necessary.
+        # We get back the properly formatted orcid
+        status, checksum, oid = check if check is not None else checksums.check_orcids([orcid_string])[0]
+        if status == checksums.FORMAT:
+            r.error("Your orcid could not be validated - format is incorrect")
+            return
+        
+        if oid not in orcid_string:
+            r.warn("Your orcid lacks hyphenation; preferred format for orcid is nnnn-nnnn-nnnn-nnnn")
+            correction_required = True
+        
+        if status == checksums.CHECKSUM:
             r.error("The calculated checksum did not match the provided checksum")
             return
         
@@ -94,7 +105,7 @@ class ORCID(plugin.Validator):
         
         # this may be a url with other things after it (orcid API permits this, for example)
         # so let's check
-        if orcid_string[-1] not in ["1", "2", "3", "4", "5", "6", "7", "8", "9", "X"]:
+        if orcid_string[-1] not in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "X"]:
             r.error("There appears to have stuff beyond the end of the identifier")
             correction_required = True
         
@@ -103,22 +114,6 @@ class ORCID(plugin.Validator):
         
         return oid
         
-    def _checksum(self, orcid_string):
-        norm = orcid_string.replace(" ", "").replace("-", "")
-        digits = [a for i, a in enumerate(norm) if i < 15]
-        total = 0
-        for i in digits:
-            total = (total + int(i)) * 2
-        remainder = total % 11
-        check = (12 - remainder) % 12
-        
-        if check == 10:
-            return "X"
-        else:
-            return str(check)
-    
-    def _correct(self, s):
-        return s[:4] + "-" + s[4:8] + "-" + s[8:12] + "-" + s[12:]
 
 class ORCIDWrapper(plugin.DataWrapper):
     def __init__(self, raw):
@@ -143,9 +138,8 @@ class ORCIDWrapper(plugin.DataWrapper):
         return got
 
 class Name(plugin.Comparator):
-    def supports(self, datatype, **comparison_options):
-        lower = datatype.lower()
-        return lower in ["name", "author"]
+    datatypes = ["name", "author"]
+    cost = 1
     
     def compare(self, datatype, original, comparison, **comparison_options):
         r = plugin.ComparisonResponse()
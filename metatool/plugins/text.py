@@ -5,10 +5,7 @@ except ImportError:
 import Levenshtein
 
 class TitleAbstract(plugin.Validator):
-
-    def supports(self, datatype, *args, **kwargs):
-        lower = datatype.lower()
-        return lower == "title" or lower == "description" or lower == "abstract"
+    datatypes = ["title", "description", "abstract"]
         
     def validate(self, datatype, value, *arg, **kwargs):
         r = plugin.ValidationResponse()
@@ -35,8 +32,9 @@ class TitleAbstract(plugin.Validator):
         return r
 
 class Equivalent(plugin.Comparator):
-    def supports(self, datatype, **comparison_options):
-        return False
+    # only compares when subclassed with the datatypes to compare
+    datatypes = []
+    cost = 1
     
     def compare(self, datatype, original, comparison, **comparison_options):
         r = plugin.ComparisonResponse()
@@ -45,8 +43,9 @@ class Equivalent(plugin.Comparator):
         return r
 
 class LevenshteinDistance(plugin.Comparator):
-    def supports(self, datatype, **comparison_options):
-        return False
+    # only compares when subclassed with the datatypes to compare
+    datatypes = []
+    cost = 100
     
     def compare(self, datatype, original, comparison, **comparison_options):
         r = plugin.ComparisonResponse()
@@ -69,3 +68,80 @@ class LevenshteinDistance(plugin.Comparator):
             r.correction(comparison)
             
         return r
+
+class NGramIndex(object):
+    """
+    An inverted index from character n-grams to the strings which contain them,
+    for finding the strings most similar to a query (by Levenshtein ratio) 
+    without comparing the query to every string in the index
+    """
+    def __init__(self, n=3, min_overlap=0.5):
+        self.n = n
+        # proportion of the query's n-grams a string must share to be considered
+        self.min_overlap = min_overlap
+        self._ids = {}      # string -> id
+        self._strings = []  # id -> string
+        self._postings = {} # n-gram -> set of ids
+    
+    def add(self, s):
+        s = self._normalise(s)
+        if s in self._ids:
+            return
+        id = len(self._strings)
+        self._ids[s] = id
+        self._strings.append(s)
+        for gram in self._ngrams(s):
+            if gram not in self._postings:
+                self._postings[gram] = set()
+            self._postings[gram].add(id)
+    
+    def remove(self, s):
+        s = self._normalise(s)
+        id = self._ids.pop(s, None)
+        if id is None:
+            return
+        # the id is not re-used, so it is enough to leave it out of the postings
+        self._strings[id] = None
+        for gram in self._ngrams(s):
+            self._postings[gram].discard(id)
+            if len(self._postings[gram]) == 0:
+                del self._postings[gram]
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    def similar(self, query, k=5, threshold=0.8):
+        # returns up to k (string, ratio) pairs for the indexed strings whose
+        # Levenshtein ratio to the query is at least the threshold, best first
+        query = self._normalise(query)
+        grams = sorted(self._ngrams(query), key=lambda g: len(self._postings.get(g, ())))
+        if len(grams) == 0:
+            return []
+        
+        # any string sharing at least required of the grams must contain one
+        # of the len(grams) - required + 1 rarest ones, so we need only look 
+        # for candidates in those posting lists, and count the rest for them
+        required = max(1, int(len(grams) * self.min_overlap))
+        candidates = set()
+        for gram in grams[:len(grams) - required + 1]:
+            candidates.update(self._postings.get(gram, ()))
+        
+        results = []
+        for id in candidates:
+            shared = len([g for g in grams if id in self._postings.get(g, ())])
+            if shared < required:
+                continue
+            ratio = Levenshtein.ratio(query, self._strings[id])
+            if ratio >= threshold:
+                results.append((self._strings[id], ratio))
+        results.sort(key=lambda r: (-r[1], r[0]))
+        return results[:k]
+    
+    def _normalise(self, s):
+        if not isinstance(s, unicode):
+            s = s.decode("utf-8")
+        return u" ".join(s.lower().split())
+    
+    def _ngrams(self, s):
+        padded = u" " * (self.n - 1) + s + u" " * (self.n - 1)
+        return set([padded[i:i + self.n] for i in range(len(padded) - self.n + 1)])
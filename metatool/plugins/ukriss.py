@@ -7,9 +7,7 @@ from lxml import etree
 
 class OutputsNodes(plugin.NodeMaker):
     NS = "{urn:xmlns:org:eurocris:cerif-1.6-2}"
-    
-    def supports(self, modeltype, **nodemaker_options):
-        return modeltype == "ukriss_outputs"
+    modeltypes = ["ukriss_outputs"]
         
     def get_nodes(self, modeltype, model_stream, **nodemaker_options):
         tree = etree.parse(model_stream)
@@ -100,165 +98,145 @@ class OutputsNodes(plugin.NodeMaker):
 
 class OutputsModel(plugin.Generator):
     NS = "{urn:xmlns:org:eurocris:cerif-1.6-2}"
-
-    def supports(self, modeltype, **generator_options):
-        return modeltype == "ukriss_outputs"
+    modeltypes = ["ukriss_outputs"]
     
-    def generate(self, modeltype, model_stream, **generator_options):
-        tree = etree.parse(model_stream)
-        root = tree.getroot()
-        
-        fieldsets = []
-        fs = plugin.FieldSet()
-        rp = root.find(self.NS + "cfResPubl")
-        
-        # date published
-        rpd = rp.find(self.NS + "cfResPublDate")
-        if rpd is not None:
-            fs.field("cfResPublDate", "date", rpd.text, "published_date")
-        
-        # volume number
-        vol = rp.find(self.NS + "cfVol")
-        if vol is not None:
-            fs.field("cfVol", "integer", vol.text, "volume")
-        
-        # edition
-        ed = rp.find(self.NS + "cfEdition")
-        if ed is not None:
-            fs.field("cfEdition", "edition", ed.text, "edition")
-        
-        # issue number
-        issue = rp.find(self.NS + "cfIssue")
-        if issue is not None:
-            fs.field("cfIssue", "number", issue.text, "issue")
-        
-        # start page
-        sp = rp.find(self.NS + "cfStartPage")
-        if sp is not None:
-            fs.field("cfStartPage", "integer", sp.text, "start_page")
-        
-        # end page
-        ep = rp.find(self.NS + "cfEndPage")
-        if ep is not None:
-            fs.field("cfEndPage", "integer", ep.text, "end_page")
-        
+    # the child elements of a cfResPubl which map directly onto fields, as
+    # (element, field name, datatype, crossref), and optionally the field for
+    # the language given in the element's cfLangCode attribute, which goes in a
+    # fieldset of its own.  The first of each element is used
+    properties = [
+        ("cfResPublDate", "cfResPublDate", "date", "published_date"),
+        ("cfVol", "cfVol", "integer", "volume"),
+        ("cfEdition", "cfEdition", "edition", "edition"),
+        ("cfIssue", "cfIssue", "number", "issue"),
+        ("cfStartPage", "cfStartPage", "integer", "start_page"),
+        ("cfEndPage", "cfEndPage", "integer", "end_page"),
         # FIXME: we could do some validation here? total = end - start
-        # total pages
-        tp = rp.find(self.NS + "cfTotalPages")
-        if tp is not None:
-            fs.field("cfTotalPages", "integer", tp.text, "page_count")
-        
-        uri = rp.find(self.NS + "cfURI")
-        if uri is not None:
-            fs.field("cfURI", "uri", uri.text, "uri")
-            
-        title = rp.find(self.NS + "cfTitle")
-        if title is not None:
-            fs.field("cfTitle", "title", title.text, "title")
-            
-            lang = title.get("cfLangCode")
-            if lang is not None:
-                titlelang = plugin.FieldSet()
-                titlelang.field("cfTitle/cfLangCode", "iso-639-1", lang, "language")
-                fieldsets.append(titlelang)
-        
-        abstract = rp.find(self.NS + "cfAbstr")
-        if abstract is not None:
-            fs.field("cfAbstr", "abstract", abstract.text, "abstract")
-            
-            lang = abstract.get("cfLangCode")
-            if lang is not None:
-                abslang = plugin.FieldSet()
-                abslang.field("cfAbstract/cfLangCode", "iso-639-1", lang, "language")
-                fieldsets.append(abslang)
-        
-        classes = rp.findall(self.NS + "cfResPubl_Class")
-        for c in classes:
-            scheme = c.find(self.NS + "cfClassSchemeId")
-            cid = c.find(self.NS + "cfClassId")
-            
-            if scheme.text == "iso:639-1":
-                fs.field("cfResPubl_Class/cfClassSchemeId/iso:639-1", "iso-639-1", cid.text, "language")
-            
-            if scheme.text == "rcuk:oa-policy-embargo-periods-scheme-uuid":
-                fs.field("cfResPubl_Class/rcuk:oa-policy-embargo-periods-scheme-uuid", "embargo", cid.text, "embargo")
-            
-        prp = rp.findall(self.NS + "cfProj_ResPubl")
-        for p in prp:
-            scheme = p.find(self.NS + "cfClassSchemeId")
-            cid = p.find(self.NS + "cfClassId")
-            pid = p.find(self.NS + "cfProjId")
-            
-            if (scheme.text == "ukriss:grant-reference-scheme-uuid" and 
-                    cid.text == "grant-uuid" and pid is not None):
-                fs.field("cfProj_ResPubl/cfClassSchemeId/grant", "grant_number", pid.text, "grant_number")
-        
-        fids = rp.findall(self.NS + "cfFedId")
-        for fid in fids:
-            fed = fid.find(self.NS + "cfFedId")
-            fcl = fid.find(self.NS + "cfFedId_Class")
-            scheme = fcl.find(self.NS + "cfClassSchemeId")
-            cid = fcl.find(self.NS + "cfClassId")
-            
-            if (scheme.text == "ukriss:identifier-types-scheme-uuid" and 
-                    cid.text == "handle-uuid"):
-                fs.field("cfFedId/handle", "handle", fed.text, "publication_identifier")
+        ("cfTotalPages", "cfTotalPages", "integer", "page_count"),
+        ("cfURI", "cfURI", "uri", "uri"),
+        ("cfTitle", "cfTitle", "title", "title", ("cfTitle/cfLangCode", "iso-639-1", "language")),
+        ("cfAbstr", "cfAbstr", "abstract", "abstract", ("cfAbstract/cfLangCode", "iso-639-1", "language"))
+    ]
+    
+    # the child elements of a cfResPubl which map onto fields according to 
+    # their classification, as (element, path to the classification within it,
+    # class scheme, class id (None for any), path to the value, field name, 
+    # datatype, crossref).  Where there are several, the last is used
+    classifications = [
+        ("cfResPubl_Class", "", "iso:639-1", None, "cfClassId", "cfResPubl_Class/cfClassSchemeId/iso:639-1", "iso-639-1", "language"),
+        ("cfResPubl_Class", "", "rcuk:oa-policy-embargo-periods-scheme-uuid", None, "cfClassId", "cfResPubl_Class/rcuk:oa-policy-embargo-periods-scheme-uuid", "embargo", "embargo"),
+        ("cfProj_ResPubl", "", "ukriss:grant-reference-scheme-uuid", "grant-uuid", "cfProjId", "cfProj_ResPubl/cfClassSchemeId/grant", "grant_number", "grant_number"),
+        ("cfFedId", "cfFedId_Class/", "ukriss:identifier-types-scheme-uuid", "handle-uuid", "cfFedId", "cfFedId/handle", "handle", "publication_identifier"),
+        ("cfFedId", "cfFedId_Class/", "ukriss:identifier-types-scheme-uuid", "isbn-uuid", "cfFedId", "cfFedId/isbn", "isbn", "isbn"),
+        ("cfFedId", "cfFedId_Class/", "ukriss:identifier-types-scheme-uuid", "issn-uuid", "cfFedId", "cfFedId/issn", "issn", "issn"),
+        ("cfFedId", "cfFedId_Class/", "ukriss:identifier-types-scheme-uuid", "pubmed-uuid", "cfFedId", "cfFedId/pubmed", "pmid", "publication_identifier"),
+        ("cfFedId", "cfFedId_Class/", "ukriss:identifier-types-scheme-uuid", "doi-uuid", "cfFedId", "cfFedId/doi", "doi", "publication_identifier")
+    ]
+    
+    def __init__(self):
+        self._compile()
+    
+    def _compile(self):
+        # namespaced tag -> (position, mapping) for the properties
+        self._properties = {}
+        for position, mapping in enumerate(self.properties):
+            self._properties[self.NS + mapping[0]] = (position, mapping)
+        
+        # namespaced tag -> (scheme xpath, class id xpath, value xpath, 
+        # {(scheme, class id) : (field name, datatype, crossref)}) for the
+        # classified elements
+        xpaths = {}
+        def xpath(path):
+            if path not in xpaths:
+                xpaths[path] = etree.XPath(path, namespaces={"cf" : self.NS[1:-1]})
+            return xpaths[path]
+        
+        self._classifications = {}
+        for element, class_path, scheme, cid, value_path, field_name, datatype, crossref in self.classifications:
+            tag = self.NS + element
+            if tag not in self._classifications:
+                self._classifications[tag] = (xpath(self._cf(class_path + "cfClassSchemeId")), 
+                                                xpath(self._cf(class_path + "cfClassId")), 
+                                                xpath(self._cf(value_path)), {})
+            self._classifications[tag][3][(scheme, cid)] = (field_name, datatype, crossref)
+    
+    def _cf(self, path):
+        return "/".join(["cf:" + step for step in path.split("/")])
+    
+    def generate(self, modeltype, model_stream, **generator_options):
+        # only the first output in the model
+        for fieldsets in self.iter_generate(modeltype, model_stream, **generator_options):
+            return fieldsets
+        return []
+    
+    def iter_generate(self, modeltype, model_stream, **generator_options):
+        # read the outputs one at a time, throwing each away once its 
+        # fieldsets have been made, so that the whole file is never in memory
+        if hasattr(model_stream, "read"):
+            model_stream = EncodedStream(model_stream)
+        for event, rp in etree.iterparse(model_stream, events=("end",), tag=self.NS + "cfResPubl"):
+            parent = rp.getparent()
+            if parent is None or parent.getparent() is not None:
+                # not a top level cfResPubl
+                continue
             
-            if (scheme.text == "ukriss:identifier-types-scheme-uuid" and 
-                    cid.text == "isbn-uuid"):
-                fs.field("cfFedId/isbn", "isbn", fed.text, "isbn")
-        
-            if (scheme.text == "ukriss:identifier-types-scheme-uuid" and 
-                    cid.text == "issn-uuid"):
-                fs.field("cfFedId/issn", "issn", fed.text, "issn")
-        
-            if (scheme.text == "ukriss:identifier-types-scheme-uuid" and 
-                    cid.text == "pubmed-uuid"):
-                fs.field("cfFedId/pubmed", "pmid", fed.text, "publication_identifier")
+            fieldsets = self._fieldsets(rp)
+            rp.clear()
+            while rp.getprevious() is not None:
+                del parent[0]
+            yield fieldsets
+    
+    def _fieldsets(self, rp):
+        fs = plugin.FieldSet()
+        langs = {}
+        seen = set()
+        
+        # a single pass over the output's children
+        for child in rp:
+            prop = self._properties.get(child.tag)
+            if prop is not None:
+                position, mapping = prop
+                if position in seen:
+                    continue
+                seen.add(position)
+                fs.field(mapping[1], mapping[2], child.text, mapping[3])
+                
+                lang = child.get("cfLangCode") if len(mapping) > 4 else None
+                if lang is not None:
+                    langfs = plugin.FieldSet()
+                    langfs.field(mapping[4][0], mapping[4][1], lang, mapping[4][2])
+                    langs[position] = langfs
+                continue
             
-            if (scheme.text == "ukriss:identifier-types-scheme-uuid" and 
-                    cid.text == "doi-uuid"):
-                fs.field("cfFedId/doi", "doi", fed.text, "publication_identifier")
-        
+            classified = self._classifications.get(child.tag)
+            if classified is not None:
+                scheme_xp, cid_xp, value_xp, fields = classified
+                scheme = self._text(scheme_xp(child))
+                cid = self._text(cid_xp(child))
+                target = fields.get((scheme, cid), fields.get((scheme, None)))
+                if target is None:
+                    continue
+                values = value_xp(child)
+                if len(values) == 0:
+                    continue
+                fs.field(target[0], target[1], values[0].text, target[2])
+        
+        # the language fieldsets come first, in the order of the properties
+        fieldsets = [langs[position] for position in sorted(langs.keys())]
         fieldsets.append(fs)
         return fieldsets
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    
+    def _text(self, elements):
+        return elements[0].text if len(elements) > 0 else None
+
+class EncodedStream(object):
+    # iterparse only reads bytes, but models may also come as text (e.g. a 
+    # StringIO of a downloaded model), which is passed on encoded as utf-8
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if isinstance(data, unicode):
+            data = data.encode("utf-8")
+        return data
@@ -0,0 +1,225 @@
+import requests, threading, urlparse, json, time, traceback
+from requests.adapters import HTTPAdapter
+from multiprocessing.pool import ThreadPool
+
+try:
+    from metatool import config
+except ImportError:
+    import config
+
+try:
+    from metatool import cache
+except ImportError:
+    import cache
+
+'''
+Shared HTTP access for the plugins.  Rather than each validator calling
+requests.get (and so opening a new connection for every value it checks), they
+should call remote.get, which re-uses kept-alive connections from pools owned
+here.  Hosts listed in config.HTTP_POOL_SIZES get a pool of their own of the
+given size, everything else shares a default pool.
+
+Lookups whose payloads are worth keeping should use remote.lookup, which
+answers from the response cache where it can.
+
+Each host also has a circuit breaker: after config.CIRCUIT_BREAKER_FAILURES
+consecutive timeouts or server errors, requests to it fail immediately with
+CircuitOpen (a kind of Timeout, so the validators report it as they would a
+timeout) until config.CIRCUIT_BREAKER_RESET seconds have passed, when a 
+single request is let through to see if the host has recovered.
+
+get_async and lookup_async return without waiting for the replies, which are
+passed to a callback instead.  The requests are made with get and lookup (so
+with the same sessions, breakers and cache) on a pool of 
+config.HTTP_ASYNC_REQUESTS threads, which is as many as can be in flight at 
+once.
+'''
+
+class CircuitOpen(requests.exceptions.Timeout):
+    pass
+
+class CircuitBreaker(object):
+    def __init__(self, failures, reset):
+        self.max_failures = failures
+        self.reset = reset
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset:
+                # let this one through to try the host, but keep the rest 
+                # waiting for another reset period in case it still fails
+                self.opened_at = time.time()
+                return True
+            self.short_circuited += 1
+            return False
+    
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.max_failures and self.opened_at is None:
+                self.opened_at = time.time()
+                self.trips += 1
+    
+    def state(self):
+        with self._lock:
+            return {
+                "state" : "closed" if self.opened_at is None else "open",
+                "failures" : self.failures,
+                "trips" : self.trips,
+                "short_circuited" : self.short_circuited
+            }
+
+class CachedResponse(object):
+    # the parts of a requests response that the plugins use
+    def __init__(self, status_code, text, url):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+# host -> requests.Session for the hosts with their own pools, and the session
+# for everything else
+_sessions = {}
+_default_session = None
+_sessions_lock = threading.Lock()
+
+# host -> CircuitBreaker
+_breakers = {}
+
+# number of lookups answered from cached client error (4xx) responses
+_negative_hits = 0
+
+def get(url, **kwargs):
+    host = _host(url)
+    breaker = _breaker(host)
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpen("Requests to " + host + " are suspended after repeated failures")
+    
+    if "timeout" not in kwargs:
+        kwargs["timeout"] = config.HTTP_TIMEOUTS.get(host, config.HTTP_TIMEOUT)
+    try:
+        resp = session(host).get(url, **kwargs)
+    except requests.exceptions.Timeout:
+        if breaker is not None:
+            breaker.failure()
+        raise
+    
+    if breaker is not None:
+        if resp.status_code >= 500:
+            breaker.failure()
+        else:
+            breaker.success()
+    return resp
+
+def lookup(source, url, **kwargs):
+    # as for get, but successful responses are cached against the source name,
+    # and client errors are cached for a shorter time
+    hit = _cached(source, url)
+    if hit is not None:
+        return hit
+    resp = get(url, **kwargs)
+    _store(source, url, resp)
+    return resp
+
+def get_async(url, callback, **kwargs):
+    # as for get, but returns at once, and callback(response, error) is called
+    # when the request is done, with either the response or the exception get
+    # raised (e.g. a Timeout)
+    _get_async_pool().apply_async(_respond, (callback, get, url), kwargs)
+
+def lookup_async(source, url, callback, **kwargs):
+    # as for lookup, but passing the response to callback(response, error) as
+    # get_async does
+    _get_async_pool().apply_async(_respond, (callback, lookup, source, url), kwargs)
+
+def _cached(source, url):
+    global _negative_hits
+    hit = cache.get(source, url)
+    if hit is None:
+        return None
+    status_code, text, final_url = json.loads(hit)
+    if status_code >= 400:
+        with _sessions_lock:
+            _negative_hits += 1
+    return CachedResponse(status_code, text, final_url)
+
+def _store(source, url, resp):
+    if resp.status_code < 400:
+        cache.set(source, url, json.dumps([resp.status_code, resp.text, resp.url]))
+    elif resp.status_code < 500 and config.RESPONSE_CACHE_NEGATIVE_TTL:
+        cache.set(source, url, json.dumps([resp.status_code, resp.text, resp.url]), config.RESPONSE_CACHE_NEGATIVE_TTL)
+
+def prime(source, url, text, status_code=200):
+    # cache a payload obtained some other way (e.g. as part of a batch) as the
+    # response that lookup would get from the url
+    cache.set(source, url, json.dumps([status_code, text, url]))
+
+def stats():
+    with _sessions_lock:
+        breakers = dict([(host, breaker.state()) for host, breaker in _breakers.iteritems()])
+    return {"negative_hits" : _negative_hits, "circuit_breakers" : breakers}
+
+def _breaker(host):
+    if not config.CIRCUIT_BREAKER_FAILURES:
+        return None
+    with _sessions_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(config.CIRCUIT_BREAKER_FAILURES, config.CIRCUIT_BREAKER_RESET)
+        return _breakers[host]
+
+def session(host=None):
+    global _default_session
+    with _sessions_lock:
+        if host in config.HTTP_POOL_SIZES:
+            if host not in _sessions:
+                _sessions[host] = _make_session(config.HTTP_POOL_SIZES[host])
+            return _sessions[host]
+        if _default_session is None:
+            _default_session = _make_session(config.HTTP_POOL_SIZE)
+        return _default_session
+
+def _make_session(pool_size):
+    # connections to each host are kept alive and re-used up to pool_size at a
+    # time, which should be at least the number of threads doing lookups
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(pool_connections=config.HTTP_POOL_SIZE, pool_maxsize=pool_size))
+    s.mount("https://", HTTPAdapter(pool_connections=config.HTTP_POOL_SIZE, pool_maxsize=pool_size))
+    return s
+
+def _host(url):
+    return urlparse.urlparse(url).netloc.lower()
+
+_async_pool = None
+
+def _get_async_pool():
+    global _async_pool
+    with _sessions_lock:
+        if _async_pool is None:
+            _async_pool = ThreadPool(config.HTTP_ASYNC_REQUESTS)
+    return _async_pool
+
+def _respond(callback, f, *args, **kwargs):
+    # pass the result of f(*args, **kwargs) to callback(response, error), or
+    # the exception it raises.  Nothing waits on the pool for the callback, so
+    # if it fails the error is reported here, as a thread's would be
+    try:
+        resp = f(*args, **kwargs)
+    except Exception as e:
+        resp, error = None, e
+    else:
+        error = None
+    try:
+        callback(resp, error)
+    except Exception:
+        traceback.print_exc()
@@ -14,6 +14,11 @@ setup(
             "catflap",
             "python-Levenshtein",
             "python-dateutil"
-		]
+		],
+    extras_require = {
+        # checks long columns of ISSNs, ISBNs and ORCIDs faster, but they are
+        # checked in pure python without it
+        "numpy" : ["numpy"]
+    }
 )
 
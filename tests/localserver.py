@@ -0,0 +1,54 @@
+import threading, BaseHTTPServer, SocketServer
+
+'''
+A local HTTP server for testing the plugins which look things up remotely,
+whose resolver and service URLs are all configurable.
+'''
+
+class LocalServer(object):
+    """
+    Serves the (status code, body[, headers]) that respond(path, request body)
+    gives for each GET, on a free local port in a background thread, and 
+    records the paths requested
+    """
+    def __init__(self, respond):
+        self.respond = respond
+        self.paths = []
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.paths.append(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                response = server.respond(self.path, self.rfile.read(length))
+                status, body = response[:2]
+                headers = {"Content-Type" : "text/xml; charset=utf-8"}
+                if len(response) > 2:
+                    headers.update(response[2])
+                self.send_response(status)
+                for name, value in headers.iteritems():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+            request_queue_size = 100
+
+            def handle_error(self, request, client_address):
+                # e.g. a client which gave up waiting (as the timeout tests do)
+                pass
+
+        self.httpd = Server(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d/" % self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,255 @@
+import unittest, json, threading, time
+
+from metatool import metatool, config
+from metatool.plugins import acat, text, bibliographics
+from localserver import LocalServer
+
+JOURNALS = [
+    {"issn" : ["0916-0582"], "journal_name" : ["Integration (Tokyo, Japan)"]},
+    {"issn" : ["1234-5679", "2049-3630"], "journal_name" : ["Journal of Things"]}
+]
+
+def search(issn=None, journal_title=None):
+    # the journals with any of the ISSNs or titles searched for, ignoring case
+    # and spacing, as catflap.Journal.search gives them
+    normalise = lambda v: " ".join(v.lower().split())
+    wanted = set([normalise(v) for v in (issn or []) + (journal_title or [])])
+    return [acat.SnapshotJournal(j) for j in JOURNALS if set([normalise(v) for v in j["issn"] + j["journal_name"]]) & wanted]
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.saved = config.ACAT_SNAPSHOT
+        config.ACAT_SNAPSHOT = False
+        acat._prefetched.clear()
+        self.searched = []
+        self.catflap_search = acat.catflap.Journal.__dict__["search"]
+        acat.catflap.Journal.search = staticmethod(lambda **kwargs: self.searched.append(kwargs) or search(**kwargs))
+
+    def tearDown(self):
+        config.ACAT_SNAPSHOT = self.saved
+        acat.catflap.Journal.search = self.catflap_search
+        acat._prefetched.clear()
+
+    def test_found_issns_answered_from_prefetch(self):
+        acat.prefetch(issn=["0916-0582", "20493630", "1111-1111"])
+        self.assertEqual(self.searched, [{"issn" : ["0916-0582", "2049-3630", "1111-1111"]}])
+        self.assertEqual(acat.search(issn=["09160582"])[0].data["journal_name"], ["Integration (Tokyo, Japan)"])
+        self.assertEqual(acat.search(issn=["2049-3630"])[0].data["journal_name"], ["Journal of Things"])
+        self.assertEqual(len(self.searched), 1)
+
+    def test_misses_searched_on_their_own(self):
+        acat.prefetch(issn=["0916-0582", "1111-1111"])
+        acat.search(issn=["1111-1111"])
+        self.assertEqual(self.searched[1:], [{"issn" : ["1111-1111"]}])
+
+    def test_failed_batch_not_used(self):
+        def fail(**kwargs):
+            self.searched.append(kwargs)
+            raise IOError("ACAT unreachable")
+        acat.catflap.Journal.search = staticmethod(fail)
+        acat.prefetch(issn=["0916-0582", "2049-3630"])
+        self.assertRaises(IOError, acat.search, issn=["0916-0582"])
+        self.assertEqual(self.searched[1:], [{"issn" : ["0916-0582"]}])
+
+    def test_batches(self):
+        saved = config.ACAT_BATCH_SIZE
+        config.ACAT_BATCH_SIZE = 2
+        try:
+            acat.prefetch(issn=["0916-0582", "2049-3630", "1234-5679", "09160582"])
+        finally:
+            config.ACAT_BATCH_SIZE = saved
+        self.assertEqual(self.searched, [{"issn" : ["0916-0582", "2049-3630"]}, {"issn" : ["1234-5679"]}])
+
+    def test_titles(self):
+        acat.prefetch(journal_title=["journal of  things", "Unknown Journal", "Journal of Things"])
+        self.assertEqual(acat.search(journal_title=["Journal of Things"])[0].data["issn"], ["1234-5679", "2049-3630"])
+        acat.search(journal_title=["Unknown Journal"])
+        self.assertEqual(self.searched, [
+            {"journal_title" : ["journal of things", "unknown journal"]},
+            {"journal_title" : ["Unknown Journal"]}
+        ])
+
+class TestSuggestions(unittest.TestCase):
+    def setUp(self):
+        self.saved = (config.ACAT_SNAPSHOT, config.ACAT_SEEN_TITLES, acat._snapshot)
+        config.ACAT_SNAPSHOT = False
+        self.reset()
+        self.catflap_search = acat.catflap.Journal.__dict__["search"]
+        acat.catflap.Journal.search = staticmethod(search)
+
+    def tearDown(self):
+        config.ACAT_SNAPSHOT, config.ACAT_SEEN_TITLES, acat._snapshot = self.saved
+        acat.catflap.Journal.search = self.catflap_search
+        self.reset()
+
+    def reset(self):
+        acat._prefetched.clear()
+        acat._seen.clear()
+        acat._seen_titles = text.NGramIndex()
+
+    def test_titles_seen_without_snapshot(self):
+        self.assertEqual(acat.similar_titles("Jounral of Things"), [])
+        acat.search(issn=["2049-3630"])
+        self.assertEqual(acat.similar_titles("Jounral of Things"), ["Journal of Things"])
+        self.assertEqual(acat.similar_titles("Something Else Entirely"), [])
+
+    def test_titles_prefetched_without_snapshot(self):
+        acat.prefetch(issn=["0916-0582", "2049-3630"])
+        self.assertEqual(acat.similar_titles("Integration (Tokyo Japan)"), ["Integration (Tokyo, Japan)"])
+
+    def test_seen_titles_bounded(self):
+        config.ACAT_SEEN_TITLES = 1
+        acat.search(issn=["2049-3630"])
+        acat.search(issn=["0916-0582"])
+        self.assertEqual(acat.similar_titles("Jounral of Things"), [])
+        self.assertEqual(acat.similar_titles("Integration (Tokyo Japan)"), ["Integration (Tokyo, Japan)"])
+        self.assertEqual(len(acat._seen_titles), 1)
+
+    def test_snapshot_titles(self):
+        config.ACAT_SNAPSHOT = True
+        snapshot = acat.JournalSnapshot()
+        snapshot.add("1", JOURNALS[1])
+        snapshot.updated = time.time()
+        acat._snapshot = snapshot
+        self.assertEqual(acat.similar_titles("Jounral of Things"), ["Journal of Things"])
+        self.assertEqual(acat.similar_titles("Integration (Tokyo Japan)"), [])
+
+    def test_validator_alternatives(self):
+        acat.search(issn=["2049-3630"])
+        r = bibliographics.JournalName().validate_realism("journal_title", "Jounral of Things")
+        self.assertEqual(r.get_alternatives(), ["Journal of Things"])
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.server = LocalServer(self.respond)
+        self.saved = (config.ACAT_ES_HOST, config.ACAT_JOURNAL_INDEX, config.ACAT_SNAPSHOT, config.ACAT_SNAPSHOT_PATH)
+        config.ACAT_ES_HOST = self.server.url.rstrip("/")
+        config.ACAT_JOURNAL_INDEX = self.server.url + "acat/journal"
+        config.ACAT_SNAPSHOT = True
+        config.ACAT_SNAPSHOT_PATH = None
+        self.reset()
+
+    def tearDown(self):
+        self.release.set()
+        if acat._updater is not None:
+            acat._updater.join()
+        self.server.stop()
+        config.ACAT_ES_HOST, config.ACAT_JOURNAL_INDEX, config.ACAT_SNAPSHOT, config.ACAT_SNAPSHOT_PATH = self.saved
+        self.reset()
+
+    def reset(self):
+        acat._snapshot = None
+        acat._snapshot_file_read = False
+        acat._updater = None
+        acat._update_failed = None
+
+    def respond(self, path, body):
+        # an ACAT which is down, unless the scan is for recent changes, of 
+        # which there are none
+        self.release.wait()
+        if "range" in body or body == "recent":
+            return self.recent(path, body)
+        return self.full_load(path, body)
+
+    def recent(self, path, body):
+        return 200, json.dumps({"_scroll_id" : "recent", "hits" : {"total" : 0, "hits" : []}})
+
+    def full_load(self, path, body):
+        return 500, "Internal Server Error"
+
+    def assertLoadFails(self):
+        self.assertEqual(acat.get_snapshot(), None)
+        acat._updater.join()
+        self.assertEqual(acat.get_snapshot(), None)
+        self.assertTrue(acat._update_failed is not None)
+
+    def test_error_response_fails_load(self):
+        self.full_load = lambda path, body: (404, json.dumps({"error" : "IndexMissingException[[acat] missing]", "status" : 404}))
+        self.assertLoadFails()
+
+    def test_missing_scroll_id_fails_load(self):
+        self.full_load = lambda path, body: (200, json.dumps({"hits" : {"total" : 1, "hits" : []}}))
+        self.assertLoadFails()
+
+    def test_failed_page_fails_load(self):
+        def full_load(path, body):
+            if "scan" in path:
+                return 200, json.dumps({"_scroll_id" : "all", "hits" : {"total" : 2, "hits" : []}})
+            if body == "all":
+                page = {"_scroll_id" : "rest", "hits" : {"hits" : [{"_id" : "1", "_source" : JOURNALS[0]}]}}
+                return 200, json.dumps(page)
+            return 500, json.dumps({"error" : "SearchContextMissingException"})
+        self.full_load = full_load
+        self.assertLoadFails()
+        self.assertEqual(len(self.server.paths), 3)
+
+    def test_partial_page_fails_refresh(self):
+        current = acat.JournalSnapshot()
+        current.add("1", JOURNALS[0])
+        current.updated = 0
+        acat._snapshot = current
+        self.recent = lambda path, body: (200, json.dumps({"_scroll_id" : "recent", "_shards" : {"total" : 5, "successful" : 4, "failed" : 1}, "hits" : {"hits" : []}}))
+        acat.get_snapshot()
+        acat._updater.join()
+        self.assertTrue(acat.get_snapshot() is current)
+        self.assertTrue(acat._update_failed is not None)
+
+    def test_load(self):
+        def full_load(path, body):
+            if "scan" in path:
+                return 200, json.dumps({"_scroll_id" : "all", "hits" : {"total" : 2, "hits" : []}})
+            hits = [{"_id" : str(i), "_source" : j} for i, j in enumerate(JOURNALS)] if body == "all" else []
+            return 200, json.dumps({"_scroll_id" : "rest", "hits" : {"hits" : hits}})
+        self.full_load = full_load
+        acat.get_snapshot()
+        acat._updater.join()
+        self.assertEqual(len(acat.get_snapshot().journals), 2)
+        self.assertEqual(acat._update_failed, None)
+
+    def test_failed_load_backs_off(self):
+        self.assertEqual(acat.get_snapshot(), None)
+        acat._updater.join()
+        self.assertEqual(len(self.server.paths), 1)
+        self.assertEqual(acat.get_snapshot(), None)
+        self.assertEqual(acat._updater, None)
+        self.assertEqual(len(self.server.paths), 1)
+
+        acat._update_failed -= config.ACAT_SNAPSHOT_RETRY + 1
+        acat.get_snapshot()
+        acat._updater.join()
+        self.assertEqual(len(self.server.paths), 2)
+
+    def test_current_snapshot_served_during_refresh(self):
+        current = acat.JournalSnapshot()
+        current.add("1", JOURNALS[0])
+        current.updated = 0
+        acat._snapshot = current
+        self.release.clear()
+        started = time.time()
+        self.assertTrue(acat.get_snapshot() is current)
+        self.assertTrue(time.time() - started < 1)
+
+        updater = acat._updater
+        self.release.set()
+        updater.join()
+        refreshed = acat.get_snapshot()
+        self.assertFalse(refreshed is current)
+        self.assertTrue(refreshed.updated > 0)
+        self.assertEqual(refreshed.search(issn=["09160582"])[0].data, JOURNALS[0])
+
+    def test_remove(self):
+        snapshot = acat.JournalSnapshot()
+        snapshot.add("1", JOURNALS[0])
+        snapshot.add("2", JOURNALS[1])
+        snapshot.add("3", {"issn" : ["2049-3630"], "journal_name" : ["Journal of Things"]})
+        snapshot.remove("1")
+        snapshot.remove("2")
+        self.assertEqual(snapshot.search(issn=["0916-0582"]), [])
+        self.assertEqual(snapshot.titles.similar("Integration (Tokyo, Japan)"), [])
+        self.assertEqual([t for t, r in snapshot.titles.similar("Journal of Things")], ["journal of things"])
+        self.assertEqual(len(snapshot.search(issn=["2049-3630"])), 1)
+
+if __name__ == "__main__":
+    unittest.main()
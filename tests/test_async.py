@@ -0,0 +1,154 @@
+import unittest, json, threading, time, sys
+from StringIO import StringIO
+
+from metatool import config, cache, remote, metatool, plugin
+from localserver import LocalServer
+
+CSL = {"DOI" : "10.1234/abc", "URL" : "http://dx.doi.org/10.1234/abc", "title" : "A Paper", "page" : "1-10"}
+
+class Resolvers(object):
+    # stands in for doi.org and handle.net; once "wanted" requests have
+    # arrived, they are all answered together
+    def __init__(self, wanted=0):
+        self.wanted = wanted
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.condition = threading.Condition()
+
+    def __call__(self, path, body):
+        with self.condition:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+            self.condition.notify_all()
+            deadline = time.time() + 2
+            while self.most_in_flight < self.wanted and time.time() < deadline:
+                self.condition.wait(0.1)
+            self.in_flight -= 1
+        if path.startswith("/doi/10.1234/"):
+            return 200, json.dumps(dict(CSL, DOI=path[len("/doi/"):])), {"Content-Type" : "application/json"}
+        if path.startswith("/hdl/1234/"):
+            return 303, "", {"Location" : "/landing/" + path[len("/hdl/"):]}
+        if path.startswith("/landing/"):
+            return 200, "<html></html>", {"Content-Type" : "text/html"}
+        if path == "/slow":
+            time.sleep(1)
+        return 404, "Not Found"
+
+class AsyncTestCase(unittest.TestCase):
+    wanted = 0
+
+    def setUp(self):
+        self.resolvers = Resolvers(self.wanted)
+        self.server = LocalServer(self.resolvers)
+        self.saved = (config.DOI_RESOLVER, config.HANDLE_RESOLVER, config.RESPONSE_CACHE_BACKEND, cache._cache, config.CIRCUIT_BREAKER_FAILURES)
+        config.DOI_RESOLVER = self.server.url + "doi/"
+        config.HANDLE_RESOLVER = self.server.url + "hdl/"
+        config.RESPONSE_CACHE_BACKEND = None
+        config.CIRCUIT_BREAKER_FAILURES = None
+        cache._cache = None
+
+    def tearDown(self):
+        self.server.stop()
+        config.DOI_RESOLVER, config.HANDLE_RESOLVER, config.RESPONSE_CACHE_BACKEND, cache._cache, config.CIRCUIT_BREAKER_FAILURES = self.saved
+
+    def get_async(self, url, **kwargs):
+        done = threading.Event()
+        got = []
+        def callback(resp, error):
+            got.append((resp, error))
+            done.set()
+        remote.get_async(url, callback, **kwargs)
+        done.wait(5)
+        return got[0]
+
+class TestGetAsync(AsyncTestCase):
+    def test_response(self):
+        resp, error = self.get_async(self.server.url + "doi/10.1234/abc")
+        self.assertEqual(error, None)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.text)["title"], "A Paper")
+
+    def test_redirect(self):
+        resp, error = self.get_async(self.server.url + "hdl/1234/5678")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.url, self.server.url + "landing/1234/5678")
+
+    def test_not_found(self):
+        resp, error = self.get_async(self.server.url + "doi/10.9999/missing")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_timeout(self):
+        resp, error = self.get_async(self.server.url + "slow", timeout=0.2)
+        self.assertEqual(resp, None)
+        self.assertTrue(isinstance(error, remote.requests.exceptions.Timeout))
+
+    def test_lookup(self):
+        cache._cache = cache.MemoryCache()
+        got = []
+        for i in range(2):
+            done = threading.Event()
+            remote.lookup_async("crossref", self.server.url + "doi/10.1234/abc", lambda resp, error: got.append(resp) or done.set())
+            done.wait(5)
+        self.assertEqual([r.status_code for r in got], [200, 200])
+        self.assertEqual(len(self.server.paths), 1)
+
+    def test_callback_error_reported(self):
+        done = threading.Event()
+        def callback(resp, error):
+            done.set()
+            raise ValueError("callback failed")
+        saved = sys.stderr
+        sys.stderr = StringIO()
+        try:
+            remote.get_async(self.server.url + "doi/10.1234/abc", callback)
+            done.wait(5)
+            deadline = time.time() + 5
+            while "callback failed" not in sys.stderr.getvalue() and time.time() < deadline:
+                time.sleep(0.01)
+            reported = sys.stderr.getvalue()
+        finally:
+            sys.stderr = saved
+        self.assertTrue("ValueError: callback failed" in reported)
+
+class TestAsyncValidation(AsyncTestCase):
+    def fieldset(self, n):
+        fs = plugin.FieldSet()
+        fs.field("doi", "doi", ["10.1234/%d" % i for i in range(n)] + ["10.9999/missing"])
+        fs.field("handle", "handle", ["http://hdl.handle.net/1234/5678"])
+        return fs
+
+    def test_same_as_sync(self):
+        sync = self.fieldset(3)
+        metatool.validate_fieldset(sync)
+        fs = self.fieldset(3)
+        validated = metatool.async_validate_fieldset(fs).get(10)
+        self.assertTrue(validated is fs)
+        self.assertEqual(fs.as_dict(), sync.as_dict())
+        self.assertEqual(fs.get_validations("handle", "http://hdl.handle.net/1234/5678")[0].data.url, self.server.url + "landing/1234/5678")
+
+    def test_callback(self):
+        got = []
+        metatool.async_validate_fieldset(self.fieldset(1), callback=got.append).get(10)
+        self.assertEqual(len(got), 1)
+
+    def test_callback_error_raised(self):
+        def callback(fieldset):
+            raise ValueError("callback failed")
+        result = metatool.async_validate_fieldset(self.fieldset(1), callback=callback)
+        self.assertRaises(ValueError, result.get, 10)
+
+class TestLookupsInFlight(AsyncTestCase):
+    # more lookups than there are threads validating or connections in the 
+    # pool, which the stand-in resolver only answers once they have all arrived
+    wanted = 40
+
+    def test_no_thread_per_lookup(self):
+        fs = plugin.FieldSet()
+        fs.field("doi", "doi", ["10.1234/%d" % i for i in range(self.wanted)])
+        metatool.async_validate_fieldset(fs).get(10)
+        self.assertEqual(self.resolvers.most_in_flight, self.wanted)
+        self.assertTrue(self.wanted > config.VALIDATION_THREADS + config.HTTP_POOL_SIZE)
+        self.assertTrue(self.wanted <= config.HTTP_ASYNC_REQUESTS)
+
+if __name__ == "__main__":
+    unittest.main()
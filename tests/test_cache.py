@@ -0,0 +1,130 @@
+import unittest, os, shutil, tempfile
+
+from metatool import config, cache, remote
+from localserver import LocalServer
+
+class Clock(object):
+    # stands in for the time module in cache, so that entries can be aged
+    def __init__(self):
+        self.now = 1000000.0
+
+    def time(self):
+        return self.now
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.saved_time = cache.time
+        cache.time = self.clock
+
+    def tearDown(self):
+        cache.time = self.saved_time
+
+class TestMemoryCache(CacheTest):
+    def make(self, max_entries=None, ttls=None, default_ttl=None):
+        return cache.MemoryCache(max_entries, ttls, default_ttl)
+
+    def test_lru_eviction(self):
+        c = self.make(max_entries=2)
+        c.set("crossref", "a", "1")
+        c.set("crossref", "b", "2")
+        self.assertEqual(c.get("crossref", "a"), "1") # a is now the most recently used
+        c.set("crossref", "c", "3")
+        self.assertEqual(c.get("crossref", "b"), None)
+        self.assertEqual(c.get("crossref", "a"), "1")
+        self.assertEqual(c.get("crossref", "c"), "3")
+        self.assertEqual(c.stats()["crossref"]["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        c = self.make(ttls={"crossref" : 60}, default_ttl=3600)
+        c.set("crossref", "a", "1")
+        c.set("entrez", "a", "2")
+        c.set("entrez", "b", "3", ttl=10)
+        self.clock.now += 30
+        self.assertEqual(c.get("crossref", "a"), "1")
+        self.assertEqual(c.get("entrez", "b"), None)
+        self.clock.now += 60
+        self.assertEqual(c.get("crossref", "a"), None)
+        self.assertEqual(c.get("entrez", "a"), "2")
+        self.clock.now += 3600
+        self.assertEqual(c.get("entrez", "a"), None)
+
+    def test_no_ttl(self):
+        c = self.make()
+        c.set("crossref", "a", "1")
+        self.clock.now += 10 ** 9
+        self.assertEqual(c.get("crossref", "a"), "1")
+
+class TestSQLiteCache(TestMemoryCache):
+    def setUp(self):
+        super(TestSQLiteCache, self).setUp()
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestSQLiteCache, self).tearDown()
+        shutil.rmtree(self.dir)
+
+    def make(self, max_entries=None, ttls=None, default_ttl=None):
+        c = cache.SQLiteCache(os.path.join(self.dir, "cache.sqlite"), max_entries, ttls, default_ttl)
+        c.TRIM_INTERVAL = 1
+        return c
+
+    def test_lru_eviction(self):
+        c = self.make(max_entries=2)
+        c.set("crossref", "a", "1")
+        self.clock.now += 1
+        c.set("crossref", "b", "2")
+        self.clock.now += 1
+        self.assertEqual(c.get("crossref", "a"), "1") # a is now the most recently used
+        self.clock.now += 1
+        c.set("crossref", "c", "3")
+        self.assertEqual(c.get("crossref", "b"), None)
+        self.assertEqual(c.get("crossref", "a"), "1")
+        self.assertEqual(c.get("crossref", "c"), "3")
+        self.assertEqual(c.stats()["crossref"]["evictions"], 1)
+
+    def test_persists(self):
+        self.make().set("crossref", "a", u"caf\xe9")
+        self.assertEqual(self.make().get("crossref", "a"), u"caf\xe9")
+
+class TestNegativeCaching(CacheTest):
+    def setUp(self):
+        super(TestNegativeCaching, self).setUp()
+        self.server = LocalServer(lambda path, body: (404, "not found") if path.startswith("/missing") else (200, "found"))
+        self.saved = (config.RESPONSE_CACHE_NEGATIVE_TTL, cache._cache)
+        config.RESPONSE_CACHE_NEGATIVE_TTL = 60
+        cache._cache = cache.MemoryCache(default_ttl=3600)
+
+    def tearDown(self):
+        super(TestNegativeCaching, self).tearDown()
+        self.server.stop()
+        config.RESPONSE_CACHE_NEGATIVE_TTL, cache._cache = self.saved
+
+    def test_negative_ttl(self):
+        url = self.server.url + "missing"
+        hits = remote.stats()["negative_hits"]
+        self.assertEqual(remote.lookup("test", url).status_code, 404)
+        self.assertEqual(remote.lookup("test", url).status_code, 404)
+        self.assertEqual(len(self.server.paths), 1)
+        self.assertEqual(remote.stats()["negative_hits"], hits + 1)
+
+        # the client error is forgotten long before a successful response would be
+        self.clock.now += 120
+        self.assertEqual(remote.lookup("test", url).status_code, 404)
+        self.assertEqual(len(self.server.paths), 2)
+
+        found = self.server.url + "found"
+        self.assertEqual(remote.lookup("test", found).text, "found")
+        self.clock.now += 120
+        self.assertEqual(remote.lookup("test", found).text, "found")
+        self.assertEqual(len(self.server.paths), 3)
+
+    def test_negative_caching_disabled(self):
+        config.RESPONSE_CACHE_NEGATIVE_TTL = None
+        url = self.server.url + "missing"
+        remote.lookup("test", url)
+        remote.lookup("test", url)
+        self.assertEqual(len(self.server.paths), 2)
+
+if __name__ == "__main__":
+    unittest.main()
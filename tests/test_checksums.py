@@ -0,0 +1,73 @@
+import unittest, random
+
+from metatool import checksums
+from metatool.checksums import VALID, FORMAT, CHECKSUM
+
+ISSNS = [
+    ("0317-8471", (VALID, "1", None)),
+    ("2049-3630", (VALID, "0", None)),
+    ("1050-124X", (VALID, "X", None)),
+    ("03178471", (VALID, "1", "0317-8471")),
+    ("0317-8472", (CHECKSUM, "1", None)),
+    ("317-8471", (FORMAT, None, None))
+]
+
+ISBNS = [
+    ("978-0-306-40615-7", (VALID, "7", "9780306406157")),
+    ("0-306-40615-2", (VALID, "2", "0306406152")),
+    ("ISBN: 0 306 40615 2", (VALID, "2", "0306406152")),
+    ("080442957X", (VALID, "X", "080442957X")),
+    ("978-0-306-40615-8", (CHECKSUM, "7", "9780306406158")),
+    ("12345", (FORMAT, None, "12345"))
+]
+
+ORCIDS = [
+    ("0000-0002-1825-0097", (VALID, "7", "0000-0002-1825-0097")),
+    ("http://orcid.org/0000-0002-1694-233X", (VALID, "X", "0000-0002-1694-233X")),
+    ("0000000218250097", (VALID, "7", "0000-0002-1825-0097")),
+    ("0000-0002-1825-0098", (CHECKSUM, "7", "0000-0002-1825-0098")),
+    ("not an orcid", (FORMAT, None, None))
+]
+
+class TestChecksums(unittest.TestCase):
+    def check(self, f, cases, repeat=1):
+        values = [value for value, expected in cases] * repeat
+        self.assertEqual(f(values), [expected for value, expected in cases] * repeat)
+
+    def test_issns(self):
+        self.check(checksums.check_issns, ISSNS)
+
+    def test_isbns(self):
+        self.check(checksums.check_isbns, ISBNS)
+
+    def test_orcids(self):
+        self.check(checksums.check_orcids, ORCIDS)
+
+    def test_batches(self):
+        # long enough columns are checked with numpy, where it is installed
+        repeat = checksums.NUMPY_MIN_BATCH
+        self.check(checksums.check_issns, ISSNS, repeat)
+        self.check(checksums.check_isbns, ISBNS, repeat)
+        self.check(checksums.check_orcids, ORCIDS, repeat)
+
+    def test_empty(self):
+        self.assertEqual(checksums.check_issns([]), [])
+
+class TestChecksumsWithoutNumpy(TestChecksums):
+    # numpy is optional, and everything is checked in pure python without it
+    def setUp(self):
+        self.saved = checksums.numpy
+        checksums.numpy = None
+
+    def tearDown(self):
+        checksums.numpy = self.saved
+
+    @unittest.skipIf(checksums.numpy is None, "numpy is not installed")
+    def test_same_as_numpy(self):
+        bodies = ["".join([str(random.randint(0, 9)) for i in range(15)]) for j in range(checksums.NUMPY_MIN_BATCH * 2)]
+        pure = checksums.check_digits("orcid", bodies)
+        checksums.numpy = self.saved
+        self.assertEqual(checksums.check_digits("orcid", bodies), pure)
+
+if __name__ == "__main__":
+    unittest.main()
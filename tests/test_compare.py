@@ -0,0 +1,124 @@
+import unittest
+from copy import deepcopy
+from collections import OrderedDict
+
+from metatool import metatool, plugin
+
+class Source(plugin.DataWrapper):
+    def source_name(self):
+        return "test"
+
+class Counting(plugin.Comparator):
+    # matches values which are the same ignoring case, counting the comparisons
+    def __init__(self):
+        self.calls = 0
+
+    def compare(self, datatype, original, comparison, **comparison_options):
+        self.calls += 1
+        r = plugin.ComparisonResponse()
+        r.success = original.lower() == comparison.lower()
+        return r
+
+def baseline_list_compare(comparison_register, datatype, original, compare, comparator_plugins, data_source, first_only=False, **comparison_options):
+    # _list_compare as it was before it was rewritten, which every comparison
+    # register should still agree with.  With first_only, each pair is only
+    # compared until a comparator succeeds
+    additional = deepcopy(compare)
+    for o in original:
+        for c in compare:
+            for name, p in comparator_plugins.iteritems():
+                result = p.compare(datatype, o, c, **comparison_options)
+                result.compared_with = c
+                result.comparator = name
+                result.data_source = data_source.source_name()
+                if result.success:
+                    metatool._append(comparison_register, o, result)
+                    if o in additional:
+                        additional.remove(o)
+                    if first_only:
+                        break
+        if o not in comparison_register:
+            comparison_register[o] = []
+    return additional
+
+# (crossref name, original values, comparison values)
+CASES = [
+    ("issued_date", ["n.d.", "2001"], ["n.d.", "2001-01-01"]),
+    ("published_date", ["11/2001", "2001-11"], ["2001-11-01", "November 2001", "2001-11-01"]),
+    ("publication_identifier", ["10.1000/abc", "http://example.com/x"], 
+        ["http://dx.doi.org/10.1000/abc", "10.1000/abc", "http://example.com/x", "10.1000/abc"]),
+    ("title", ["Entities and Identities in Research Information Systems", "A Title"], 
+        ["Entities and Identities in Research Information Systems", 
+         "Entities and identities in research information systems", 
+         "Entities and Identities in Research Information System", "Something Else"]),
+    ("issn", ["0317-8471", "0317-8471"], ["0317-8471", "0317-8471", "2049-3630"])
+]
+
+def summarise(register):
+    return dict([(o, [(r.comparator, r.compared_with, r.success, r.get_corrections(), r.data_source) for r in results]) 
+                    for o, results in register.iteritems()])
+
+class TestRegister(unittest.TestCase):
+    def check(self, first_only, **options):
+        for crossref, original, compare in CASES:
+            comparators = metatool._comparators_for(crossref)
+            self.assertTrue(len(comparators) > 0)
+            expected = {}
+            expected_additional = baseline_list_compare(expected, crossref, original, compare, comparators, Source(), first_only)
+            register = {}
+            additional = metatool._list_compare(register, crossref, original, compare, comparators, Source(), **options)
+            self.assertEqual(summarise(register), summarise(expected), crossref)
+            self.assertEqual(additional, expected_additional, crossref)
+
+    def test_exhaustive_matches_baseline(self):
+        self.check(False, exhaustive_comparison=True)
+
+    def test_matches_baseline_first_successes(self):
+        self.check(True)
+
+    def test_identifiers(self):
+        # the doi is matched with both forms of itself, by different comparators
+        register = {}
+        additional = metatool._list_compare(register, "publication_identifier", ["10.1000/abc"], ["http://dx.doi.org/10.1000/abc", "10.1000/abc"], 
+                                            metatool._comparators_for("publication_identifier"), Source())
+        self.assertEqual([(r.comparator, r.compared_with) for r in register["10.1000/abc"]], [
+            ("bibliographics.DOICompare", "http://dx.doi.org/10.1000/abc"),
+            ("bibliographics.URICompare", "10.1000/abc")
+        ])
+        self.assertEqual(additional, ["http://dx.doi.org/10.1000/abc"])
+
+class TestListCompare(unittest.TestCase):
+    def setUp(self):
+        self.cheap = Counting()
+        self.expensive = Counting()
+        self.comparators = OrderedDict([("cheap", self.cheap), ("expensive", self.expensive)])
+
+    def test_distinct_pairs_compared_once(self):
+        register = {}
+        additional = metatool._list_compare(register, "title", ["a", "b", "C", "a"], ["b", "a", "c", "d", "d"], self.comparators, Source())
+        self.assertEqual([(r.compared_with, r.comparator) for r in register["a"]], [("a", "cheap"), ("a", "cheap")])
+        self.assertEqual([(r.compared_with, r.comparator) for r in register["C"]], [("c", "cheap")])
+        # each distinct original is compared once with each distinct value, 
+        # stopping at the first comparator to succeed
+        self.assertEqual(self.cheap.calls, 12)
+        self.assertEqual(self.expensive.calls, 9)
+        self.assertEqual(additional, ["c", "d", "d"])
+
+    def test_unmatched(self):
+        register = {}
+        additional = metatool._list_compare(register, "title", ["x"], ["a"], self.comparators, Source())
+        self.assertEqual(register, {"x" : []})
+        self.assertEqual(additional, ["a"])
+
+    def test_exhaustive(self):
+        register = {}
+        additional = metatool._list_compare(register, "title", ["a", "A"], ["a", "a"], self.comparators, Source(), exhaustive_comparison=True)
+        # the copies of "a" are only compared once each, but registered for both
+        self.assertEqual(self.cheap.calls, 2)
+        self.assertEqual(self.expensive.calls, 2)
+        self.assertEqual(len(register["a"]), 4)
+        self.assertEqual(len(register["A"]), 4)
+        self.assertEqual(additional, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest, re
+from lxml import etree
+
+from metatool import config, cache
+from metatool.plugins import bibliographics
+from localserver import LocalServer
+
+# the esummary record for pmid 12345678, as returned by
+# eutils/esummary.fcgi?db=pubmed&id=12345678
+ESUMMARY = """<?xml version="1.0" encoding="UTF-8" ?>
+<!DOCTYPE eSummaryResult PUBLIC "-//NLM//DTD esummary v1 20041029//EN" "http://eutils.ncbi.nlm.nih.gov/eutils/dtd/20041029/esummary-v1.dtd">
+<eSummaryResult>
+<DocSum>
+	<Id>12345678</Id>
+	<Item Name="PubDate" Type="Date">1994 Jun</Item>
+	<Item Name="EPubDate" Type="Date"></Item>
+	<Item Name="Source" Type="String">Integration</Item>
+	<Item Name="AuthorList" Type="List">
+		<Item Name="Author" Type="String">Ministerial Meeting on Population of the Non-Aligned Movement (1993: Bali)</Item>
+	</Item>
+	<Item Name="LastAuthor" Type="String">Ministerial Meeting on Population of the Non-Aligned Movement (1993: Bali)</Item>
+	<Item Name="Title" Type="String">Denpasar Declaration on Population and Development.</Item>
+	<Item Name="Volume" Type="String"></Item>
+	<Item Name="Issue" Type="String">40</Item>
+	<Item Name="Pages" Type="String">27-9</Item>
+	<Item Name="LangList" Type="List">
+		<Item Name="Lang" Type="String">English</Item>
+	</Item>
+	<Item Name="NlmUniqueID" Type="String">8610149</Item>
+	<Item Name="ISSN" Type="String">0916-0582</Item>
+	<Item Name="ESSN" Type="String"></Item>
+	<Item Name="PubTypeList" Type="List">
+		<Item Name="PubType" Type="String">Journal Article</Item>
+	</Item>
+	<Item Name="RecordStatus" Type="String">PubMed - indexed for MEDLINE</Item>
+	<Item Name="PubStatus" Type="String">ppublish</Item>
+	<Item Name="ArticleIds" Type="List">
+		<Item Name="pubmed" Type="String">12345678</Item>
+		<Item Name="eid" Type="String"></Item>
+		<Item Name="rid" Type="String">12345678</Item>
+	</Item>
+	<Item Name="History" Type="List">
+		<Item Name="pubmed" Type="Date">1994/06/01 00:00</Item>
+		<Item Name="medline" Type="Date">2002/10/09 04:00</Item>
+		<Item Name="entrez" Type="Date">1994/06/01 00:00</Item>
+	</Item>
+	<Item Name="References" Type="List"></Item>
+	<Item Name="HasAbstract" Type="Integer">0</Item>
+	<Item Name="PmcRefCount" Type="Integer">0</Item>
+	<Item Name="FullJournalName" Type="String">Integration (Tokyo, Japan)</Item>
+	<Item Name="ELocationID" Type="String"></Item>
+	<Item Name="SO" Type="String">1994 Jun;(40):27-9</Item>
+</DocSum>
+
+</eSummaryResult>
+"""
+
+class TestEntrezSummaryWrapper(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = bibliographics.EntrezSummaryWrapper(etree.fromstring(ESUMMARY))
+
+    def test_empty_items_skipped(self):
+        self.assertEqual(self.wrapper.get("issn"), ["0916-0582"])
+        self.assertEqual(self.wrapper.get("volume"), None)
+        self.assertEqual(self.wrapper.get("doi"), None)
+        self.assertEqual(sorted(self.wrapper.get("publication_identifier")), ["12345678"])
+
+    def test_fields(self):
+        self.assertEqual(self.wrapper.get("pmid"), ["12345678"])
+        self.assertEqual(self.wrapper.get("issue"), ["40"])
+        self.assertEqual(sorted(self.wrapper.get("journal_title")), ["Integration", "Integration (Tokyo, Japan)"])
+        self.assertEqual(self.wrapper.get("publication_type"), ["Journal Article"])
+        self.assertEqual(self.wrapper.get("published_date"), ["1994-06"])
+
+    def test_pages(self):
+        self.assertEqual(self.wrapper.get("pages"), ["27-9"])
+        self.assertEqual(self.wrapper.get("start_page"), ["27"])
+        self.assertEqual(self.wrapper.get("end_page"), ["9"])
+
+def esummary(path, body):
+    # a summary of each of the requested ids below 1000, as entrez would give
+    ids = [i for i in re.search("id=([0-9,]+)", path).group(1).split(",") if int(i) < 1000]
+    docs = ["<DocSum><Id>%s</Id><Item Name=\"Title\" Type=\"String\">Title %s</Item></DocSum>" % (i, i) for i in ids]
+    return 200, "<eSummaryResult>" + "".join(docs) + "</eSummaryResult>"
+
+class TestPMIDColumn(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalServer(esummary)
+        self.saved = (config.ENTREZ_ESUMMARY, config.RESPONSE_CACHE_BACKEND, cache._cache)
+        config.ENTREZ_ESUMMARY = self.server.url + "esummary.fcgi"
+        config.RESPONSE_CACHE_BACKEND = None
+        cache._cache = None
+
+    def tearDown(self):
+        self.server.stop()
+        config.ENTREZ_ESUMMARY, config.RESPONSE_CACHE_BACKEND, cache._cache = self.saved
+
+    def test_batch_used_without_response_cache(self):
+        pmids = ["1", "2", "pmid:3", "2"]
+        responses = bibliographics.PMID().validate_column("pmid", pmids, entrez_summary=True)
+        self.assertEqual(len(self.server.paths), 1)
+        self.assertEqual([r.data.get("title") for r in responses], [["Title 1"], ["Title 2"], ["Title 3"], ["Title 2"]])
+        self.assertEqual(responses[2].get_corrections(), ["3"])
+
+    def test_missing_looked_up_singly(self):
+        responses = bibliographics.PMID().validate_column("pmid", ["1", "1234"], entrez_summary=True)
+        self.assertEqual(len(self.server.paths), 2)
+        self.assertTrue(self.server.paths[1].endswith("id=1234"))
+        self.assertEqual(responses[0].data.get("title"), ["Title 1"])
+
+if __name__ == "__main__":
+    unittest.main()
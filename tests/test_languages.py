@@ -0,0 +1,41 @@
+import unittest, os, shutil, tempfile
+
+from metatool import languages
+
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.codes = languages._codes_path()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_cached(self):
+        cache_path = os.path.join(self.dir, "language_codes.marshal")
+        parsed = languages._load(self.codes, cache_path)
+        self.assertTrue(os.path.exists(cache_path))
+        self.assertEqual(languages._load(self.codes, cache_path), parsed)
+        self.assertEqual(os.listdir(self.dir), ["language_codes.marshal"])
+
+    def test_unwritable_cache_ignored(self):
+        # somewhere that can't be written to, whoever we are
+        blocker = os.path.join(self.dir, "file")
+        open(blocker, "w").close()
+        cache_path = os.path.join(blocker, "language_codes.marshal")
+        self.assertEqual(languages._load(self.codes, cache_path), languages._parse(self.codes))
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+    def test_corrupt_cache_ignored(self):
+        cache_path = os.path.join(self.dir, "language_codes.marshal")
+        with open(cache_path, "wb") as f:
+            f.write("not marshalled")
+        self.assertEqual(languages._load(self.codes, cache_path), languages._parse(self.codes))
+
+    def test_registry(self):
+        registry = languages.LanguageRegistry(languages._parse(self.codes))
+        self.assertEqual(registry.to_iso6392("en"), "eng")
+        self.assertEqual(registry.to_iso6392("french"), "fre")
+        self.assertEqual(registry.partial_matches("germ", 1), ["german"])
+
+if __name__ == "__main__":
+    unittest.main()
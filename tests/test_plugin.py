@@ -0,0 +1,94 @@
+import unittest, os, shutil, tempfile, json
+
+from metatool import metatool, config, plugin
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.saved = (config.PLUGIN_MANIFEST, config.PLUGIN_LAZY_LOAD, plugin._discovered, dict(plugin._modules))
+        config.PLUGIN_MANIFEST = os.path.join(self.dir, "plugin_manifest.json")
+        config.PLUGIN_LAZY_LOAD = True
+        self.restart()
+
+    def tearDown(self):
+        config.PLUGIN_MANIFEST, config.PLUGIN_LAZY_LOAD, plugin._discovered, modules = self.saved
+        plugin._modules.clear()
+        plugin._modules.update(modules)
+        shutil.rmtree(self.dir)
+
+    def restart(self):
+        plugin._discovered = None
+        plugin._modules.clear()
+
+    def test_lazy_from_manifest(self):
+        scanned = plugin.load_comparators()
+        self.assertTrue(os.path.exists(config.PLUGIN_MANIFEST))
+
+        self.restart()
+        comparators = plugin.load_comparators()
+        self.assertEqual(sorted(comparators.keys()), sorted(scanned.keys()))
+        self.assertTrue(all([isinstance(c, plugin.LazyPlugin) for c in comparators.values()]))
+
+        # ordering the comparators by cost does not import them
+        costs = dict([(name, c.cost) for name, c in comparators.iteritems()])
+        self.assertEqual(costs, dict([(name, c.cost) for name, c in scanned.iteritems()]))
+        self.assertEqual(plugin._modules, {})
+
+        # using one does
+        index, undeclared = plugin.index_by_datatype(comparators)
+        name, issn = index["issn"][0]
+        self.assertTrue(issn.compare("issn", "1234-5679", "1234-5679").success)
+        self.assertEqual(plugin._modules.keys(), [name.split(".")[0]])
+
+    def test_manifest_without_costs_rewritten(self):
+        plugin.load_comparators()
+        with open(config.PLUGIN_MANIFEST) as f:
+            manifest = json.loads(f.read())
+        for entry in manifest["modules"].values():
+            for info in entry["classes"].values():
+                del info["cost"]
+        with open(config.PLUGIN_MANIFEST, "w") as f:
+            f.write(json.dumps(manifest))
+
+        self.restart()
+        comparators = plugin.load_comparators()
+        self.assertFalse(any([isinstance(c, plugin.LazyPlugin) for c in comparators.values()]))
+        self.restart()
+        comparators = plugin.load_comparators()
+        self.assertTrue(all([isinstance(c, plugin.LazyPlugin) for c in comparators.values()]))
+
+    def test_compiled_modules_do_not_stale_manifest(self):
+        # compiling the plugins writes .pyc files into their directory after
+        # the manifest has been written, which changes the directory's mtime
+        plugin.load_comparators()
+        plugin_dir = plugin._plugin_dir()
+        mtime = os.path.getmtime(plugin_dir)
+        os.utime(plugin_dir, (mtime + 10, mtime + 10))
+        try:
+            self.restart()
+            comparators = plugin.load_comparators()
+        finally:
+            os.utime(plugin_dir, (mtime, mtime))
+        self.assertTrue(all([isinstance(c, plugin.LazyPlugin) for c in comparators.values()]))
+
+    def test_new_module_stales_manifest(self):
+        plugin.load_comparators()
+        with open(config.PLUGIN_MANIFEST) as f:
+            manifest = json.loads(f.read())
+        del manifest["modules"]["text"]
+        with open(config.PLUGIN_MANIFEST, "w") as f:
+            f.write(json.dumps(manifest))
+        self.restart()
+        self.assertEqual(plugin._load_manifest(), None)
+
+    def test_disabled(self):
+        config.PLUGIN_MANIFEST = None
+        plugin.load_comparators()
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_relative_path(self):
+        config.PLUGIN_MANIFEST = "plugin_manifest.json"
+        self.assertEqual(plugin._manifest_path(), os.path.join(os.path.dirname(os.path.realpath(plugin.__file__)), "plugin_manifest.json"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest, time
+
+from metatool import config, cache, remote
+from localserver import LocalServer
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_cycle(self):
+        breaker = remote.CircuitBreaker(2, 0.2)
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state()["state"], "closed")
+        breaker.failure()
+        self.assertEqual(breaker.state()["state"], "open")
+        self.assertFalse(breaker.allow())
+
+        # half open: one request is let through after the reset period, and 
+        # the rest wait for it
+        time.sleep(0.25)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state(), {"state" : "closed", "failures" : 0, "trips" : 1, "short_circuited" : 2})
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_failure(self):
+        breaker = remote.CircuitBreaker(1, 0.2)
+        breaker.failure()
+        time.sleep(0.25)
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state()["state"], "open")
+        self.assertFalse(breaker.allow())
+
+class TestGet(unittest.TestCase):
+    def setUp(self):
+        self.status = 500
+        self.server = LocalServer(lambda path, body: (self.status, "body"))
+        self.saved = (config.CIRCUIT_BREAKER_FAILURES, config.CIRCUIT_BREAKER_RESET, cache._cache)
+        config.CIRCUIT_BREAKER_FAILURES = 2
+        config.CIRCUIT_BREAKER_RESET = 0.2
+        cache._cache = cache.MemoryCache()
+
+    def tearDown(self):
+        self.server.stop()
+        config.CIRCUIT_BREAKER_FAILURES, config.CIRCUIT_BREAKER_RESET, cache._cache = self.saved
+
+    def test_server_errors_open_breaker(self):
+        url = self.server.url + "flaky"
+        self.assertEqual(remote.get(url).status_code, 500)
+        self.assertEqual(remote.get(url).status_code, 500)
+        self.assertRaises(remote.CircuitOpen, remote.get, url)
+        self.assertEqual(len(self.server.paths), 2)
+
+        self.status = 200
+        time.sleep(0.25)
+        self.assertEqual(remote.get(url).status_code, 200)
+        self.assertEqual(remote.get(url).status_code, 200)
+        self.assertEqual(len(self.server.paths), 4)
+
+if __name__ == "__main__":
+    unittest.main()
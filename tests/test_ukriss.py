@@ -0,0 +1,172 @@
+import unittest, os
+from StringIO import StringIO
+
+from metatool import metatool
+from metatool.plugins import ukriss
+
+# three outputs, with the fieldsets OutputsModel.generate made for each of
+# them (as the only output in a file) before it read the outputs as a stream
+SAMPLE = """<CERIF xmlns="urn:xmlns:org:eurocris:cerif-1.6-2" date="2013-07-31" sourceDatabase="test">
+<cfResPubl>
+	<cfResPublId>output-1</cfResPublId>
+	<cfResPublDate>2013-07-01</cfResPublDate>
+	<cfVol>12</cfVol>
+	<cfIssue>3</cfIssue>
+	<cfTitle cfLangCode="en" cfTrans="o">Entities and Identities in Research Information Systems</cfTitle>
+	<cfAbstr cfLangCode="de" cfTrans="o">Eine Zusammenfassung</cfAbstr>
+	<cfResPubl_Class>
+		<cfClassId>en</cfClassId>
+		<cfClassSchemeId>iso:639-1</cfClassSchemeId>
+	</cfResPubl_Class>
+	<cfResPubl_Class>
+		<cfClassId>6months</cfClassId>
+		<cfClassSchemeId>rcuk:oa-policy-embargo-periods-scheme-uuid</cfClassSchemeId>
+	</cfResPubl_Class>
+	<cfProj_ResPubl>
+		<cfProjId>EP/K000001/1</cfProjId>
+		<cfClassId>grant-uuid</cfClassId>
+		<cfClassSchemeId>ukriss:grant-reference-scheme-uuid</cfClassSchemeId>
+	</cfProj_ResPubl>
+	<cfFedId>
+		<cfFedId>10.1016/S0550-3213(01)00405-9</cfFedId>
+		<cfFedId_Class>
+			<cfClassId>doi-uuid</cfClassId>
+			<cfClassSchemeId>ukriss:identifier-types-scheme-uuid</cfClassSchemeId>
+		</cfFedId_Class>
+	</cfFedId>
+	<cfFedId>
+		<cfFedId>0317-8471</cfFedId>
+		<cfFedId_Class>
+			<cfClassId>issn-uuid</cfClassId>
+			<cfClassSchemeId>ukriss:identifier-types-scheme-uuid</cfClassSchemeId>
+		</cfFedId_Class>
+	</cfFedId>
+</cfResPubl>
+<cfResPubl>
+	<cfResPublId>output-2</cfResPublId>
+	<cfEdition>2nd</cfEdition>
+	<cfStartPage>185</cfStartPage>
+	<cfEndPage>194</cfEndPage>
+	<cfTotalPages>10</cfTotalPages>
+	<cfURI>http://eprints.rclis.org/17176/</cfURI>
+	<cfTitle>A Book</cfTitle>
+	<cfResPubl_Class>
+		<cfClassId>book-uuid</cfClassId>
+		<cfClassSchemeId>cerif:output-types-scheme-uuid</cfClassSchemeId>
+	</cfResPubl_Class>
+	<cfFedId>
+		<cfFedId>978-0-306-40615-7</cfFedId>
+		<cfFedId_Class>
+			<cfClassId>isbn-uuid</cfClassId>
+			<cfClassSchemeId>ukriss:identifier-types-scheme-uuid</cfClassSchemeId>
+		</cfFedId_Class>
+	</cfFedId>
+	<cfFedId>
+		<cfFedId>10760/17176</cfFedId>
+		<cfFedId_Class>
+			<cfClassId>handle-uuid</cfClassId>
+			<cfClassSchemeId>ukriss:identifier-types-scheme-uuid</cfClassSchemeId>
+		</cfFedId_Class>
+	</cfFedId>
+	<cfFedId>
+		<cfFedId>12345678</cfFedId>
+		<cfFedId_Class>
+			<cfClassId>pubmed-uuid</cfClassId>
+			<cfClassSchemeId>ukriss:identifier-types-scheme-uuid</cfClassSchemeId>
+		</cfFedId_Class>
+	</cfFedId>
+	<cfResPubl_ResPubl>
+		<cfResPublId2>output-1</cfResPublId2>
+		<cfClassId>host-publication</cfClassId>
+		<cfClassSchemeId>ukriss:core-profile-references-scheme-uuid</cfClassSchemeId>
+	</cfResPubl_ResPubl>
+</cfResPubl>
+<cfResPubl>
+	<cfResPublId>output-3</cfResPublId>
+	<cfTitle cfLangCode="fr">Un titre</cfTitle>
+</cfResPubl>
+<cfClassScheme>
+	<cfClassSchemeId>cerif:output-types-scheme-uuid</cfClassSchemeId>
+</cfClassScheme>
+</CERIF>
+"""
+
+# field name -> (datatype, values, crossref) for each fieldset
+EXPECTED = [
+    [
+        {"cfTitle/cfLangCode" : ("iso-639-1", ["en"], "language")},
+        {"cfAbstract/cfLangCode" : ("iso-639-1", ["de"], "language")},
+        {
+            "cfResPublDate" : ("date", ["2013-07-01"], "published_date"),
+            "cfVol" : ("integer", ["12"], "volume"),
+            "cfIssue" : ("number", ["3"], "issue"),
+            "cfTitle" : ("title", ["Entities and Identities in Research Information Systems"], "title"),
+            "cfAbstr" : ("abstract", ["Eine Zusammenfassung"], "abstract"),
+            "cfResPubl_Class/cfClassSchemeId/iso:639-1" : ("iso-639-1", ["en"], "language"),
+            "cfResPubl_Class/rcuk:oa-policy-embargo-periods-scheme-uuid" : ("embargo", ["6months"], "embargo"),
+            "cfProj_ResPubl/cfClassSchemeId/grant" : ("grant_number", ["EP/K000001/1"], "grant_number"),
+            "cfFedId/doi" : ("doi", ["10.1016/S0550-3213(01)00405-9"], "publication_identifier"),
+            "cfFedId/issn" : ("issn", ["0317-8471"], "issn")
+        }
+    ],
+    [
+        {
+            "cfEdition" : ("edition", ["2nd"], "edition"),
+            "cfStartPage" : ("integer", ["185"], "start_page"),
+            "cfEndPage" : ("integer", ["194"], "end_page"),
+            "cfTotalPages" : ("integer", ["10"], "page_count"),
+            "cfURI" : ("uri", ["http://eprints.rclis.org/17176/"], "uri"),
+            "cfTitle" : ("title", ["A Book"], "title"),
+            "cfFedId/isbn" : ("isbn", ["978-0-306-40615-7"], "isbn"),
+            "cfFedId/handle" : ("handle", ["10760/17176"], "publication_identifier"),
+            "cfFedId/pubmed" : ("pmid", ["12345678"], "publication_identifier")
+        }
+    ],
+    [
+        {"cfTitle/cfLangCode" : ("iso-639-1", ["fr"], "language")},
+        {"cfTitle" : ("title", ["Un titre"], "title")}
+    ]
+]
+
+def summarise(fieldsets):
+    return [dict([(name, (fs.datatype(name), fs.values(name), fs.crossref(name))) for name in fs.fields()]) for fs in fieldsets]
+
+class TestOutputsModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ukriss.OutputsModel()
+
+    def test_streamed(self):
+        records = self.model.iter_generate("ukriss_outputs", StringIO(SAMPLE))
+        self.assertEqual([summarise(fieldsets) for fieldsets in records], EXPECTED)
+
+    def test_generate_first(self):
+        self.assertEqual(summarise(self.model.generate("ukriss_outputs", StringIO(SAMPLE))), EXPECTED[0])
+
+    def test_text_stream(self):
+        # as the web interface passes in models it has downloaded
+        records = self.model.iter_generate("ukriss_outputs", StringIO(SAMPLE.decode("utf-8")))
+        self.assertEqual([summarise(fieldsets) for fieldsets in records], EXPECTED)
+        fieldsets = self.model.generate("ukriss_outputs", StringIO(u"<CERIF xmlns=\"urn:xmlns:org:eurocris:cerif-1.6-2\"><cfResPubl><cfTitle>Caf\xe9</cfTitle></cfResPubl></CERIF>"))
+        self.assertEqual(summarise(fieldsets), [{"cfTitle" : ("title", [u"Caf\xe9"], "title")}])
+
+    def test_example(self):
+        thisfile_dir = os.path.dirname(os.path.realpath(__file__))
+        with open(os.path.join(thisfile_dir, "..", "metatool", "static", "ukriss_outputs.xml")) as f:
+            fieldsets = summarise(self.model.generate("ukriss_outputs", f))
+        self.assertEqual(fieldsets[:2], [
+            {"cfTitle/cfLangCode" : ("iso-639-1", ["en"], "language")},
+            {"cfAbstract/cfLangCode" : ("iso-639-1", ["en"], "language")}
+        ])
+        self.assertEqual(sorted(fieldsets[2].keys()), [
+            "cfAbstr", "cfEdition", "cfEndPage", "cfFedId/doi", "cfFedId/handle", 
+            "cfFedId/isbn", "cfFedId/issn", "cfFedId/pubmed", "cfIssue", 
+            "cfProj_ResPubl/cfClassSchemeId/grant", "cfResPublDate", 
+            "cfResPubl_Class/cfClassSchemeId/iso:639-1", 
+            "cfResPubl_Class/rcuk:oa-policy-embargo-periods-scheme-uuid", 
+            "cfStartPage", "cfTitle", "cfTotalPages", "cfURI", "cfVol"
+        ])
+        self.assertEqual(fieldsets[2]["cfFedId/issn"], ("issn", ["03017-8471"], "issn"))
+        self.assertEqual(fieldsets[2]["cfVol"], ("integer", ["-"], "volume"))
+
+if __name__ == "__main__":
+    unittest.main()